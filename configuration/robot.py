@@ -5,4 +5,6 @@ LINE_WIDTH = 30
 IR_COUNT = 5
 IR_WEIGHTS = [-2, -1, 0, 1, 2]
 IR_SPACING = 12
-IR_SIZE = 5
\ No newline at end of file
+IR_SIZE = 5
+# Échantillons gardés dans les historiques PID (durée affichée sur la largeur des graphiques)
+PID_HISTORY = 100
@@ -4,4 +4,9 @@ SCREEN_HEIGHT = 650
 GRAPH_WIDTH = 400         # Largeur de la zone de graphique
 TRACK_WIDTH = SCREEN_WIDTH - GRAPH_WIDTH  # Largeur de la zone de simulation
 FPS = 60
-LINE_WIDTH = int(ROBOT_WIDTH*0.2)
\ No newline at end of file
+LINE_WIDTH = int(ROBOT_WIDTH*0.2)
+# Fréquence de référence : la vitesse des robots (pixels par frame) et les gains PID
+# sont exprimés pour un tick à cette fréquence (la boucle d'origine tournait à 10 Hz)
+REFERENCE_HZ = 10
+# Fréquence de la physique à pas fixe (indépendante du rendu à FPS)
+PHYSICS_HZ = 10
@@ -1,16 +1,39 @@
 #!/usr/bin/env python3
 """
 Simulateur Moose Test PID - Robot suiveur de ligne
-Simulation réaliste avec contrôle PID, visualisation temps réel et comparaison de deux robots
+Simulation réaliste avec contrôle PID et visualisation temps réel des robots d'un scénario JSON
 """
 # Importation des bibliothèques nécessaires
+import argparse
 import pygame
 from configuration.robot import *
 from configuration.colors import *
-from src.robot import *
-from src.track import *
-from src.utils import handle_events, record_frame
+from configuration.screen import *
+from src.track import Track
+from src.utils import handle_events, record_frame, Selection, QuickSave
 from src.visualization import Visualization
+from src.renderer import Renderer
+from src.recorder import Recorder
+from src.clock import FixedTimestep
+from src.replay_log import TraceWriter, TraceReader, ReplayPlayer
+from src.profiling import Profiler
+from src.camera import CameraSensors
+from src.scenario import load_scenario
+from src.control_server import ControlServer
+
+# Arguments : journal binaire de la simulation ou relecture d'un journal existant
+parser = argparse.ArgumentParser(description="Simulateur Moose Test PID")
+parser.add_argument('--scenario', metavar='FICHIER', default='scenarios/default.json', help="Scénario JSON (robots, piste) à simuler")
+parser.add_argument('--record-trace', metavar='FICHIER', help="Enregistre chaque tick de chaque robot dans un journal binaire")
+parser.add_argument('--replay', metavar='FICHIER', help="Rejoue un journal sans re-simuler (Espace : pause, flèches : avance/recul)")
+parser.add_argument('--profile', metavar='FICHIER', help="Active le profilage par phase (F3) et écrit ses statistiques en fin de simulation")
+parser.add_argument('--track', metavar='FICHIER', help="Piste à charger (JSON, CSV ou SVG) au lieu du Moose Test")
+parser.add_argument('--track-smoothing', choices=('catmull-rom', 'bspline'), help="Lissage de la piste chargée")
+parser.add_argument('--track-spacing', type=float, help="Rééchantillonnage de la piste à pas constant (pixels)")
+parser.add_argument('--camera', action='store_true', help="Capteurs caméra : lecture des pixels de l'image de la piste")
+parser.add_argument('--track-image', metavar='IMAGE', help="Piste peinte (image) lue par les capteurs caméra (implique --camera)")
+parser.add_argument('--control-port', type=int, metavar='PORT', help="Serveur de contrôle (JSON par ligne) : état des robots à chaque tick, commandes de direction et de gains")
+args = parser.parse_args()
 
 # Initialisation Pygame
 pygame.init()
@@ -19,55 +42,108 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT))
 screen.fill(BACKGROUND)
 pygame.display.set_caption("Simulateur Moose Test PID")
 clock = pygame.time.Clock()
-# Police
-font = pygame.font.SysFont('Arial', 18)
-title_font = pygame.font.SysFont('Arial', 28, bold=True)
-
-track = Track()
 
-# Paramètres PID initiaux
-Kp = 0.4  #1.25
-Ki = 0.00001
-Kd = 2.0  #0.3
+# Scénario : robots (nombre, poses, couleurs, gains, capteurs) et piste éventuelle
+scenario = load_scenario(args.scenario)
 
+# Piste : fichier (traité puis mis en cache dans .cache), piste du scénario ou Moose Test par défaut
+if args.track:
+    track = Track.from_file(args.track, smoothing=args.track_smoothing, spacing=args.track_spacing, cache_dir='.cache')
+elif scenario['track'] is not None:
+    track = scenario['track']
+else:
+    track = Track()
 
 # Initialisation robots
-robots = [
-    Robot(50, HEIGHT // 2+5, BLUE, 0.1, 0.1, 0.1, 'djamel', 90),
-    Robot(50, HEIGHT // 2-10, ORANGE, 0.2, 0.0, 0.1, 'ahmed', 90),
-]
+robots = scenario['robots']
+# Robot dont les gains sont réglés au clavier (Tab pour changer)
+selection = Selection(len(robots))
+# Point de reprise en mémoire (F5 / F9)
+quicksave = QuickSave(robots, track)
 # Boucle principale
 running = True
-# Variables pour l'enregistrement
-recording = False
-frames = []
+# Enregistrement GIF en flux (F2)
+recorder = Recorder.for_loop('simulation.gif', FPS)
+
+# Journal binaire (enregistrement) ou lecteur (relecture)
+trace_log = None
+if args.record_trace:
+    # Lectures complétées jusqu'au plus grand nombre de capteurs d'un robot
+    trace_log = TraceWriter(args.record_trace, len(robots), max(len(robot.sensor_positions_local) for robot in robots))
+player = ReplayPlayer(TraceReader(args.replay), robots) if args.replay else None
+
+# Capteurs caméra : image de la piste seule (peinte ou tracée), lue en un bloc à chaque pas
+track_layer = None
+camera = None
+if args.camera or args.track_image:
+    if args.track_image:
+        track_layer = pygame.transform.scale(pygame.image.load(args.track_image).convert(), (TRACK_WIDTH, HEIGHT))
+    else:
+        track_layer = pygame.Surface((TRACK_WIDTH, HEIGHT))
+        track_layer.fill(BACKGROUND)
+        track.draw_track(track_layer)
+    camera = CameraSensors(track_layer)
+
+# Serveur de contrôle : pilotage des robots par un autre processus, sans bloquer la boucle
+control = None
+if args.control_port is not None:
+    control = ControlServer(port=args.control_port)
+    control.start()
+tick = 0
+
+# Profilage par phase (F3), quasi gratuit tant qu'il est désactivé
+profiler = Profiler(enabled=bool(args.profile))
 
 # Initialiser la classe Visualization
 viz = Visualization(WIDTH, HEIGHT)
+# Rendu en couches : piste et textes statiques en cache, mise à jour des seules zones modifiées
+renderer = Renderer(screen, track, viz, profiler, track_layer)
+# Physique à pas fixe (PHYSICS_HZ), rendu interpolé à FPS
+sim_clock = FixedTimestep(PHYSICS_HZ)
+frame_time = 0.0
 while running:
     # Gestion des événements
-    running, recording, frames = handle_events(robots, screen, running, recording, frames)
+    with profiler.section('events'):
+        running = handle_events(robots, screen, running, recorder, player, profiler, selection,
+                                quicksave if player is None else None)
 
-    # Effacer l'écran
-    screen.fill(BACKGROUND)
-    track.draw_track(screen)
+    # Logique de mise à jour des robots : autant de pas de physique que le temps écoulé
+    for _ in range(sim_clock.advance(frame_time)):
+        if player is not None:
+            # Relecture : l'état vient du journal, pas de simulation
+            player.step()
+            continue
+        with profiler.section('update'):
+            if control is not None:
+                control.apply_commands(robots)
+            if camera is not None:
+                for robot, values in zip(robots, camera.read_robots(robots)):
+                    robot.update(track, dt=sim_clock.dt, sensor_values=values)
+            else:
+                for robot in robots:
+                    robot.update(track, dt=sim_clock.dt)
+            if control is not None:
+                control.publish(tick, robots)
+        tick += 1
+        if trace_log is not None:
+            trace_log.record(robots)
 
-    # Logique de mise à jour des robots et Dessiner les éléments de la simulation
-    for robot in robots:
-        robot.draw(screen)
-        robot.update(track)
-
-    # Dessiner les informations et les graphiques
-    viz.draw_info(screen, robots, selected=0)
-    viz.draw_pid_graph(screen, robots[0].pid.error_history, robots[1].pid.error_history, TRACK_WIDTH, 0, GRAPH_WIDTH, HEIGHT/2)
-    viz.draw_pid_graph(screen, robots[0].pid.output_history, robots[1].pid.output_history, TRACK_WIDTH, HEIGHT/2, GRAPH_WIDTH, HEIGHT/2)
-    viz.draw_title(screen)
-    # Mettre à jour l'affichage
-    pygame.display.flip()
+    # Dessiner la simulation (couche statique, robots, graphiques, titre) et mettre à jour l'affichage
+    renderer.render(robots, selected=selection.index, alpha=1.0 if player is not None else sim_clock.alpha)
 
     # Enregistrer le cadre actuel si en mode enregistrement
-    frames = record_frame(screen, recording, frames)
+    with profiler.section('record'):
+        record_frame(screen, recorder)
+    profiler.end_frame()
 
     # Limiter le taux de rafraîchissement
-    clock.tick(10)
-    pygame.display.flip()
\ No newline at end of file
+    frame_time = clock.tick(FPS) / 1000
+
+# Finaliser un enregistrement en cours
+recorder.stop()
+if control is not None:
+    control.stop()
+if trace_log is not None:
+    trace_log.close()
+if args.profile:
+    profiler.dump(args.profile)
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Banc d'essai des chemins critiques (pas de simulation, capteurs, PID, rendu).
+
+Les résultats sont écrits en JSON pour être comparés d'un commit à l'autre :
+    python -m src.benchmark -o bench.json
+    python -m src.benchmark -o new.json --compare bench.json --tolerance 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+from configuration.screen import SCREEN_HEIGHT, SCREEN_WIDTH, TRACK_WIDTH
+from src.kernels import NUMBA_AVAILABLE
+from src.pid_controller import PID
+from src.robot import Robot
+from src.swarm import RobotSwarm
+from src.track import Track
+
+TRACK_SIZES = (10, 1_000, 100_000)
+# Modules du cœur de la simulation (workers de balayage, optimiseur) : importables sans pygame
+CORE_MODULES = ('src.pid_controller', 'src.robot', 'src.track', 'src.simulation', 'src.swarm', 'src.sweep')
+SWARM_SIZES = (1, 10, 100, 1_000, 10_000)
+
+
+def measure(fn, min_time: float = 0.2, repeat: int = 3) -> float:
+    """Durée moyenne d'un appel à ``fn`` (meilleure de ``repeat`` séries d'au moins ``min_time`` s)."""
+    best = float('inf')
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+        best = min(best, elapsed / calls)
+    return best
+
+
+def synthetic_track(n_points: int) -> Track:
+    """Piste sinusoïdale de ``n_points`` points traversant la zone de simulation."""
+    track = Track()
+    xs = np.linspace(50, TRACK_WIDTH - 50, n_points)
+    ys = SCREEN_HEIGHT / 2 + 100 * np.sin((xs - 50) / 80)
+    track.set_track_points(list(zip(xs.tolist(), ys.tolist())))
+    return track
+
+
+def make_robot() -> Robot:
+    return Robot(50, SCREEN_HEIGHT // 2, kp=0.1, ki=0.0, kd=0.1, theta=90, record_history=False)
+
+
+def bench_robot_update(track: Track, min_time: float) -> float:
+    """Ticks par seconde de Robot.update (le robot repart du départ tous les 300 ticks)."""
+    robot = make_robot()
+    track.get_segment_index()
+    state = {'ticks': 0}
+
+    def tick():
+        robot.update(track)
+        state['ticks'] += 1
+        if state['ticks'] % 300 == 0:
+            robot.reset()
+
+    return 1.0 / measure(tick, min_time)
+
+
+def bench_sensor_distances(track: Track, min_time: float) -> float:
+    """Durée (s) d'un appel à get_sensor_distances_to_track."""
+    robot = make_robot()
+    robot.get_sensor_positions()
+    track.get_segment_index()
+    return measure(lambda: robot.get_sensor_distances_to_track(track), min_time)
+
+
+def bench_swarm_step(n: int, track: Track, min_time: float, fused: bool = False) -> float:
+    """Pas de robot par seconde d'un RobotSwarm de taille n (chemin NumPy ou noyau fusionné)."""
+    swarm = RobotSwarm(n, 50, SCREEN_HEIGHT // 2, 90, kp=np.linspace(0.05, 0.5, n), kd=0.1, fused=fused)
+    # Premier pas hors mesure (compilation Numba éventuelle)
+    swarm.step(track)
+    swarm.reset()
+    state = {'ticks': 0}
+
+    def step():
+        swarm.step(track)
+        state['ticks'] += 1
+        if state['ticks'] % 300 == 0:
+            swarm.reset()
+
+    return n / measure(step, min_time)
+
+
+def bench_core_import(repeat: int = 3) -> float:
+    """
+    Durée (s) de l'import des modules du cœur dans un interpréteur neuf (meilleure de ``repeat``).
+
+    Échoue si l'un d'eux charge pygame.
+    """
+    code = ("import sys, time; start = time.perf_counter(); "
+            f"import {', '.join(CORE_MODULES)}; "
+            "print(time.perf_counter() - start, 'pygame' in sys.modules)")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = float('inf')
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                                capture_output=True, text=True).stdout.split()
+        if output[1] == 'True':
+            raise RuntimeError("Le cœur de la simulation importe pygame")
+        best = min(best, float(output[0]))
+    return best
+
+
+def bench_render(min_time: float) -> dict:
+    """Durées (s) de Robot.draw et d'une image complète (Renderer), avec un affichage factice."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from configuration.colors import BLUE, ORANGE
+    from src.renderer import Renderer
+    from src.visualization import Visualization
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    track = Track()
+    robots = [Robot(50, SCREEN_HEIGHT // 2 + 5, BLUE, 0.1, 0.1, 0.1, 'a', 90),
+              Robot(50, SCREEN_HEIGHT // 2 - 10, ORANGE, 0.2, 0.0, 0.1, 'b', 90)]
+    for _ in range(200):
+        for robot in robots:
+            robot.update(track)
+    renderer = Renderer(screen, track, Visualization(SCREEN_WIDTH, SCREEN_HEIGHT))
+    renderer.render(robots)
+
+    results = {
+        'robot_draw_s': measure(lambda: robots[0].draw(screen), min_time),
+        'frame_s': measure(lambda: renderer.render(robots), min_time),
+    }
+    pygame.quit()
+    return results
+
+
+def run(min_time: float = 0.2, render: bool = True) -> dict:
+    """Exécute tous les bancs d'essai et retourne le dictionnaire des résultats."""
+    results = {'core_import_s': bench_core_import()}
+    tracks = {'moose': Track()}
+    tracks.update({f'synthetic_{n}': synthetic_track(n) for n in TRACK_SIZES})
+
+    for name, track in tracks.items():
+        start = time.perf_counter()
+        track.get_segment_index()
+        results[f'segment_index_build_s.{name}'] = time.perf_counter() - start
+        results[f'robot_update_ticks_per_s.{name}'] = bench_robot_update(track, min_time)
+        results[f'sensor_distances_s.{name}'] = bench_sensor_distances(track, min_time)
+
+    pid = PID(0.4, 0.00001, 2.0)
+    results['pid_compute_s'] = measure(lambda: pid.compute(12.0, 60), min_time)
+
+    for n in SWARM_SIZES:
+        results[f'swarm_robot_ticks_per_s.{n}'] = bench_swarm_step(n, tracks['moose'], min_time)
+        # Sans Numba, le noyau fusionné tourne en Python pur : mesuré sur les petits essaims seulement
+        if NUMBA_AVAILABLE or n <= 100:
+            results[f'swarm_fused_robot_ticks_per_s.{n}'] = bench_swarm_step(n, tracks['moose'], min_time, fused=True)
+
+    if render:
+        try:
+            results.update(bench_render(min_time))
+        except ImportError:
+            print("pygame indisponible : bancs de rendu ignorés", file=sys.stderr)
+    return results
+
+
+def higher_is_better(name: str) -> bool:
+    return '_per_s' in name
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Liste des régressions (nom, ancienne valeur, nouvelle valeur) au-delà de ``tolerance``."""
+    regressions = []
+    for name, old in baseline.items():
+        new = results.get(name)
+        if new is None or not old or name.startswith('segment_index_build'):
+            continue
+        ratio = new / old if higher_is_better(name) else old / new
+        if ratio < 1 - tolerance:
+            regressions.append((name, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai du simulateur")
+    parser.add_argument('-o', '--output', default='bench_results.json')
+    parser.add_argument('--min-time', type=float, default=0.2, help="Durée minimale de chaque mesure (s)")
+    parser.add_argument('--no-render', action='store_true', help="Ignorer les bancs de rendu pygame")
+    parser.add_argument('--compare', metavar='JSON', help="Résultats de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="Dégradation relative tolérée")
+    args = parser.parse_args()
+
+    results = run(args.min_time, render=not args.no_render)
+    report = {
+        'meta': {'python': platform.python_version(), 'numpy': np.__version__, 'numba': NUMBA_AVAILABLE,
+                 'machine': platform.machine(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    for name, value in results.items():
+        print(f"{name:45s} {value:.6g}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for name, old, new in regressions:
+            print(f"RÉGRESSION {name}: {old:.6g} -> {new:.6g}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import itertools
+import numpy as np
+import pygame
+
+
+def sample_intensity(surface: pygame.Surface, points) -> np.ndarray:
+    """
+    Intensité moyenne (0-255) des pixels d'une surface sous des points (..., 2).
+
+    Tous les points sont lus en une seule indexation NumPy d'une vue ``pixels3d``
+    de la surface (sans copie, verrouillée le temps de la lecture seulement).
+    Les coordonnées sont tronquées comme ``surface.get_at((int(x), int(y)))``.
+
+    Returns:
+        np.ndarray: Intensités entières de forme (...), -1 pour les points hors de la surface
+    """
+    # Conversion en entiers par troncature vers zéro, comme int()
+    coords = np.asarray(points, dtype=float).astype(int)
+    inside = ((coords >= 0) & (coords < surface.get_size())).all(axis=-1)
+    coords[~inside] = 0
+    try:
+        pixels = pygame.surfarray.pixels3d(surface)
+    except ValueError:
+        # Surfaces 8/16 bits : pas de vue directe possible, copie
+        pixels = pygame.surfarray.array3d(surface)
+    try:
+        rgb = pixels[coords[..., 0], coords[..., 1]]
+    finally:
+        # Libère la vue (et le verrou de la surface) avant tout blit
+        del pixels
+    intensity = rgb.sum(axis=-1, dtype=int) // 3
+    intensity[~inside] = -1
+    return intensity
+
+
+class CameraSensors:
+    """
+    Capteurs « caméra » : luminosité d'une image de la piste sous chaque capteur.
+
+    L'image (``surface``) ne doit contenir que la piste (fond et ligne, tracés ou
+    peints), pas les robots ni les textes. Une ligne claire sur fond sombre donne
+    des valeurs dans la même plage que les capteurs IR (99 à 1024, 1024 sur la ligne).
+    """
+
+    def __init__(self, surface: pygame.Surface, min_value: int = 99, max_value: int = 1024):
+        self.surface = surface
+        self.min_value = min_value
+        self.max_value = max_value
+
+    def read(self, positions) -> np.ndarray:
+        """Valeurs des capteurs aux positions (..., 2), hors image comptée comme noire."""
+        intensity = np.maximum(sample_intensity(self.surface, positions), 0)
+        values = np.trunc(intensity * self.max_value / 255)
+        return np.clip(values, self.min_value, self.max_value)
+
+    def read_robots(self, robots: list) -> list:
+        """
+        Valeurs des capteurs de tous les robots, en une lecture.
+
+        Les positions de tous les capteurs sont mises bout à bout (les robots peuvent
+        avoir des nombres de capteurs différents) puis redécoupées robot par robot.
+        """
+        positions = [robot.get_sensor_positions() for robot in robots]
+        points = np.array([point for sensors in positions for point in sensors], dtype=float).reshape(-1, 2)
+        values = self.read(points).astype(int).tolist()
+        ends = list(itertools.accumulate(len(sensors) for sensors in positions))
+        return [values[end - len(sensors):end] for sensors, end in zip(positions, ends)]
@@ -0,0 +1,238 @@
+"""
+Points de reprise de la simulation : capture, restauration et embranchements.
+
+Un ``Checkpoint`` contient l'état complet de la piste et des robots (pose, capteurs,
+gains et état du PID, commande externe, historiques) : des scalaires dans ``meta``
+(sérialisable en JSON) et des tableaux NumPy dans ``arrays``. Il est indépendant
+des objets capturés, peut être restauré autant de fois que voulu et s'écrit dans
+un fichier .npz compressé.
+
+``fork`` simule de nombreuses variantes (gains, vitesse) à partir d'un même point
+de reprise, sans re-simuler le début commun.
+
+Exemple : comparer des gains à l'entrée de la courbe en S du Moose Test
+    sim = Simulation(robots=[Robot(50, 325, kp=0.1, theta=90)])
+    sim.run(60)
+    checkpoint = Checkpoint.capture(sim)
+    branches = fork(checkpoint, [{'kp': kp} for kp in np.linspace(0.05, 0.5, 64)], ticks=400)
+"""
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.metrics import trajectory_metrics
+from src.parallel import default_chunk_size
+from src.robot import Robot
+from src.simulation import Simulation
+from src.swarm import RobotSwarm
+from src.track import Track
+
+# Historiques (RingBuffer) d'un robot : nom dans le point de reprise -> chemin de l'attribut
+HISTORIES = {
+    'path_history': ('path_history',),
+    'error_history': ('pid', 'error_history'),
+    'output_history': ('pid', 'output_history'),
+}
+# Paramètres qu'une variante de ``fork`` peut modifier
+FORK_PARAMETERS = ('kp', 'ki', 'kd', 'speed')
+
+
+class Checkpoint:
+    """État complet d'une simulation à un tick donné."""
+
+    def __init__(self, meta: dict, arrays: dict):
+        self.meta = meta
+        self.arrays = arrays
+
+    @property
+    def tick(self) -> int:
+        return self.meta['tick']
+
+    @property
+    def robot_count(self) -> int:
+        return len(self.meta['robots'])
+
+    @classmethod
+    def capture(cls, simulation, track: Track = None) -> "Checkpoint":
+        """
+        Capture une ``Simulation``, ou une liste de robots et leur piste.
+
+        Toutes les valeurs sont copiées : la simulation peut continuer sans modifier le point de reprise.
+        """
+        if isinstance(simulation, Simulation):
+            robots, track = simulation.robots, simulation.track
+            tick, dt = simulation.tick, simulation.dt
+        else:
+            robots, tick, dt = simulation, 0, 1.0
+        meta = {
+            'tick': tick,
+            'dt': dt,
+            'track': {'width': track.width, 'height': track.height, 'line_width': track.line_width,
+                      'closed': bool(track.closed)},
+            'robots': [],
+        }
+        arrays = {'track_points': np.array(track.get_track_points(), dtype=float)}
+        for i, robot in enumerate(robots):
+            pid = robot.pid
+            meta['robots'].append({
+                'name': robot.name,
+                'color': [int(c) for c in robot.color],
+                'start_pos': [float(v) for v in robot.start_pos],
+                'start_angle': float(robot.start_angle),
+                'speed': float(robot.speed),
+                'record_history': robot.max_path_history > 0,
+                'x': float(robot.x),
+                'y': float(robot.y),
+                'angle': float(robot.angle),
+                'previous_pose': [float(v) for v in robot.previous_pose],
+                'current_error': float(robot.current_error),
+                'pid_output': float(robot.pid_output),
+                'steering_override': robot.steering_override,
+                'pid': {'kp': float(pid.kp), 'ki': float(pid.ki), 'kd': float(pid.kd),
+                        'integral': float(pid.integral), 'previous_error': float(pid.previous_error),
+                        'last_error': float(pid.last_error)},
+                'totals': {},
+            })
+            arrays[f'robot{i}.sensor_positions_local'] = np.array(robot.sensor_positions_local, dtype=float)
+            arrays[f'robot{i}.sensor_weights'] = np.array(robot.sensor_weights, dtype=float)
+            arrays[f'robot{i}.sensor_values'] = np.array(robot.sensor_values, dtype=float)
+            for name, path in HISTORIES.items():
+                values, total = _attribute(robot, path).state()
+                arrays[f'robot{i}.{name}'] = values
+                meta['robots'][i]['totals'][name] = total
+        return cls(meta, arrays)
+
+    def restore(self, simulation, track: Track = None):
+        """
+        Remet une ``Simulation`` (ou des robots et leur piste) dans l'état capturé.
+
+        Les robots doivent être ceux de la capture (même nombre, mêmes capteurs) ;
+        la piste n'est modifiée (et ses caches invalidés) que si ses points diffèrent.
+        """
+        if isinstance(simulation, Simulation):
+            robots, track = simulation.robots, simulation.track
+            simulation.tick = self.tick
+            simulation.dt = self.meta['dt']
+        else:
+            robots = simulation
+        if len(robots) != self.robot_count:
+            raise ValueError(f"Le point de reprise contient {self.robot_count} robots, pas {len(robots)}")
+
+        points = self.arrays['track_points']
+        if not np.array_equal(np.asarray(track.get_track_points(), dtype=float), points):
+            track.set_track_points([tuple(point) for point in points.tolist()])
+        track.closed = self.meta['track']['closed']
+
+        for i, (robot, state) in enumerate(zip(robots, self.meta['robots'])):
+            robot.x, robot.y, robot.angle = state['x'], state['y'], state['angle']
+            robot.previous_pose = tuple(state['previous_pose'])
+            robot.speed = state['speed']
+            robot.current_error = state['current_error']
+            robot.pid_output = state['pid_output']
+            robot.steering_override = state['steering_override']
+            robot.sensor_values = self.arrays[f'robot{i}.sensor_values'].tolist()
+            robot.get_sensor_positions()
+            pid = state['pid']
+            robot.pid.kp, robot.pid.ki, robot.pid.kd = pid['kp'], pid['ki'], pid['kd']
+            robot.pid.integral = pid['integral']
+            robot.pid.previous_error = pid['previous_error']
+            robot.pid.last_error = pid['last_error']
+            for name, path in HISTORIES.items():
+                _attribute(robot, path).restore(self.arrays[f'robot{i}.{name}'], state['totals'][name])
+
+    def build(self) -> Simulation:
+        """Nouvelle ``Simulation`` (piste et robots neufs) dans l'état capturé."""
+        track_state = self.meta['track']
+        track = Track(track_state['width'], track_state['height'])
+        track.line_width = track_state['line_width']
+        track.set_track_points([tuple(point) for point in self.arrays['track_points'].tolist()])
+        robots = []
+        for i, state in enumerate(self.meta['robots']):
+            robots.append(Robot(
+                *state['start_pos'], color=tuple(state['color']),
+                kp=state['pid']['kp'], ki=state['pid']['ki'], kd=state['pid']['kd'],
+                name=state['name'], theta=state['start_angle'],
+                record_history=state['record_history'], speed=state['speed'],
+                sensor_positions_local=self.arrays[f'robot{i}.sensor_positions_local'].tolist(),
+                sensor_weights=self.arrays[f'robot{i}.sensor_weights'].tolist(),
+            ))
+        simulation = Simulation(track, robots, self.meta['dt'])
+        self.restore(simulation)
+        return simulation
+
+    def save(self, path: str):
+        """Écrit le point de reprise dans un fichier .npz compressé."""
+        np.savez_compressed(path, meta=np.array(json.dumps(self.meta)), **self.arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files if name != 'meta'}
+            meta = json.loads(str(data['meta']))
+        return cls(meta, arrays)
+
+
+def _attribute(robot: Robot, path: tuple):
+    value = robot
+    for name in path:
+        value = getattr(value, name)
+    return value
+
+
+def _run_branches(checkpoint: Checkpoint, variants: list, ticks: int) -> list:
+    """Simule un lot de variantes dans un seul essaim (robots du point de reprise x variantes)."""
+    simulation = checkpoint.build()
+    robots, track = simulation.robots, simulation.track
+    n = len(robots)
+    swarm = RobotSwarm.from_robots(robots * len(variants))
+    for parameter in FORK_PARAMETERS:
+        column = getattr(swarm, parameter).reshape(len(variants), n)
+        for k, variant in enumerate(variants):
+            if parameter in variant:
+                column[k] = variant[parameter]
+    trace = swarm.run(track, ticks, checkpoint.meta['dt'])
+    metrics = trajectory_metrics(trace['x'], trace['y'], track)
+
+    branches = []
+    for k, variant in enumerate(variants):
+        robots_k = slice(k * n, (k + 1) * n)
+        branches.append({
+            'variant': variant,
+            **{key: values[:, robots_k] for key, values in trace.items()},
+            'metrics': {key: values[robots_k] for key, values in metrics.items()},
+        })
+    return branches
+
+
+def fork(checkpoint: Checkpoint, variants: list, ticks: int, workers: int = None, chunk_size: int = None) -> list:
+    """
+    Simule des variantes à partir d'un même point de reprise.
+
+    Chaque variante est un dict de paramètres appliqués à tous les robots du point
+    de reprise (``kp``, ``ki``, ``kd``, ``speed``), chaque valeur étant un scalaire ou
+    une séquence d'une valeur par robot ; ``{}`` prolonge la simulation telle quelle.
+    Les variantes sont regroupées en lots simulés chacun par un ``RobotSwarm`` (même
+    calcul que ``Robot.update``, PID compris : une commande ``steering_override`` n'est
+    pas reprise) et répartis sur les cœurs avec un ``ProcessPoolExecutor`` (taille des
+    lots : ``chunk_size``, ou déduite du nombre de variantes et de ``workers``).
+
+    Returns:
+        list: Pour chaque variante, un dict 'variant', les traces 'x', 'y', 'angle',
+        'error', 'output' de forme (ticks, n_robots) depuis le point de reprise, et
+        'metrics' (voir ``trajectory_metrics``, ticks comptés depuis le point de reprise)
+    """
+    for variant in variants:
+        unknown = set(variant) - set(FORK_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Paramètres de variante inconnus : {sorted(unknown)}")
+    # Capteurs identiques sur tous les robots (contrôlé par RobotSwarm), avant de lancer les lots
+    RobotSwarm.from_robots(checkpoint.build().robots)
+
+    chunk_size = chunk_size or default_chunk_size(len(variants), workers)
+    chunks = [variants[i:i + chunk_size] for i in range(0, len(variants), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        results = [_run_branches(checkpoint, chunk, ticks) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_branches, itertools.repeat(checkpoint), chunks, itertools.repeat(ticks)))
+    return [branch for branches in results for branch in branches]
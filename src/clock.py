@@ -0,0 +1,33 @@
+from configuration.screen import PHYSICS_HZ, REFERENCE_HZ
+
+
+class FixedTimestep:
+    """
+    Horloge de simulation à pas fixe, découplée de la fréquence d'affichage.
+
+    Le temps réel écoulé entre deux images est accumulé ; ``advance`` indique
+    combien de pas de physique de ``1 / physics_hz`` secondes exécuter, et ``alpha``
+    la fraction de pas restante pour interpoler le rendu.
+    """
+
+    def __init__(self, physics_hz: float = PHYSICS_HZ, reference_hz: float = REFERENCE_HZ,
+                 max_frame_time: float = 0.25):
+        self.physics_hz = physics_hz
+        self.step_seconds = 1.0 / physics_hz
+        # Pas de temps en ticks de référence, à passer à Robot.update / PID.compute
+        self.dt = reference_hz / physics_hz
+        # Borne du temps pris en compte par image (évite la spirale de rattrapage)
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+    def advance(self, frame_time: float) -> int:
+        """Ajoute ``frame_time`` secondes et retourne le nombre de pas de physique à exécuter."""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = int(self.accumulator // self.step_seconds)
+        self.accumulator -= steps * self.step_seconds
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fraction du pas suivant déjà écoulée (0 à 1), pour l'interpolation du rendu."""
+        return self.accumulator / self.step_seconds
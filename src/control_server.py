@@ -0,0 +1,267 @@
+"""
+Serveur de contrôle : pilotage du simulateur par un autre processus (tests matériels en boucle).
+
+Protocole : TCP local, un objet JSON par ligne dans chaque sens.
+
+Le serveur envoie à chaque tick de physique l'état de tous les robots :
+    {"tick": 42, "robots": [{"id": 0, "name": "djamel", "x": 120.5, "y": 330.1, "angle": 91.2,
+                             "sensors": [99, 99, 1024, 612, 99], "error": 203.3, "output": 0.8}, ...]}
+
+Le client envoie des commandes, pour un ou plusieurs robots par message :
+    {"robots": [{"id": 0, "steering": 1.5}, {"id": 1, "kp": 0.3, "kd": 1.0}, {"id": 2, "steering": null}]}
+
+``steering`` remplace la sortie du PID du robot (degrés par tick de référence) jusqu'à
+``"steering": null`` ; ``kp``, ``ki``, ``kd`` modifient ses gains et ``"reset": true``
+le ramène à son départ.
+
+Exemple de client :
+    import json, socket
+    sock = socket.create_connection(('127.0.0.1', 8765))
+    for line in sock.makefile():
+        state = json.loads(line)
+        steering = [{"id": r["id"], "steering": -r["error"] * 0.01} for r in state["robots"]]
+        sock.sendall((json.dumps({"robots": steering}) + "\\n").encode())
+"""
+import asyncio
+import json
+import math
+import queue
+import threading
+
+def _parse_id(value) -> int:
+    """Identifiant de robot : entier JSON strict (``1.7`` ou ``1e999`` sont refusés)."""
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f"entier attendu, pas {value!r}")
+    return value
+
+
+def _parse_float(value) -> float:
+    """Nombre JSON fini (NaN et Infinity sont refusés)."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise TypeError(f"nombre attendu, pas {value!r}")
+    if not math.isfinite(value):
+        raise ValueError(f"nombre fini attendu, pas {value!r}")
+    return float(value)
+
+
+def _parse_bool(value) -> bool:
+    """Booléen JSON strict : ``"false"`` ou ``0`` sont refusés plutôt que convertis."""
+    if not isinstance(value, bool):
+        raise TypeError(f"booléen attendu, pas {value!r}")
+    return value
+
+
+# Champs d'une commande de robot et conversion de leur valeur
+COMMAND_FIELDS = {
+    'steering': lambda value: None if value is None else _parse_float(value),
+    'kp': _parse_float,
+    'ki': _parse_float,
+    'kd': _parse_float,
+    'reset': _parse_bool,
+}
+
+
+class _Client:
+    """Connexion d'un client : file bornée des lignes à envoyer."""
+
+    def __init__(self, writer: asyncio.StreamWriter, max_pending: int):
+        self.writer = writer
+        self.pending = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0
+
+    def send(self, line: bytes):
+        """Met une ligne en file ; si le client est en retard, la plus ancienne est abandonnée."""
+        if self.pending.full():
+            self.pending.get_nowait()
+            self.dropped += 1
+        self.pending.put_nowait(line)
+
+
+class ControlServer:
+    """
+    Serveur asyncio exécuté dans son propre thread (sa propre boucle d'événements).
+
+    La boucle pygame n'attend jamais le réseau :
+    - ``publish`` confie l'état des robots au thread du serveur, qui le sérialise et
+      l'envoie à chaque client. Chaque client a une file de ``max_pending`` messages ;
+      un client trop lent perd les plus anciens (compteur ``dropped``), l'état le plus
+      récent est toujours transmis. Les messages en attente partent en un seul envoi ;
+    - les commandes reçues sont validées dans le thread du serveur puis placées dans
+      une file bornée (``max_commands``) que ``apply_commands`` vide à chaque tick.
+      File pleine : la commande est refusée et le client reçoit une erreur.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, max_pending: int = 64,
+                 max_commands: int = 4096):
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        self.commands = queue.Queue(maxsize=max_commands)
+        self.rejected = 0
+        self._clients = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def start(self):
+        """Démarre le thread du serveur et attend que le port soit ouvert."""
+        if self.running:
+            return
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        errors = []
+        self._thread = threading.Thread(target=self._run, args=(ready, errors), daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread.join()
+            self._thread = None
+            raise errors[0]
+        print(f"Serveur de contrôle : {self.host}:{self.port}")
+
+    def _run(self, ready: threading.Event, errors: list):
+        """Boucle du thread du serveur."""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as error:
+            errors.append(error)
+            ready.set()
+            self._loop.close()
+            return
+        # Port effectif (utile avec port=0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            # Arrêt : fermeture du port puis des connexions (les lectures en cours se terminent)
+            self._server.close()
+            for client in list(self._clients):
+                client.writer.close()
+            tasks = asyncio.all_tasks(self._loop)
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    def stop(self):
+        """Ferme les connexions et arrête le thread du serveur."""
+        if not self.running:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Connexion d'un client : envoi des états en tâche de fond, lecture des commandes."""
+        client = _Client(writer, self.max_pending)
+        self._clients.add(client)
+        sender = asyncio.create_task(self._send(client))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    self._receive(client, line)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(client)
+            sender.cancel()
+            writer.close()
+
+    async def _send(self, client: _Client):
+        """Envoie les lignes en attente, regroupées, au rythme que le client accepte."""
+        try:
+            while True:
+                lines = [await client.pending.get()]
+                while not client.pending.empty():
+                    lines.append(client.pending.get_nowait())
+                client.writer.writelines(lines)
+                # Attend que le tampon d'envoi se vide (contre-pression du socket)
+                await client.writer.drain()
+        except ConnectionError:
+            pass
+
+    def _receive(self, client: _Client, line: bytes):
+        """Valide un message de commandes et le transmet à la boucle principale."""
+        try:
+            message = json.loads(line)
+            commands = [self._parse_command(command) for command in message['robots']]
+        except (ValueError, TypeError, KeyError, OverflowError) as error:
+            client.send(self._encode({'error': f"Commande invalide : {error}"}))
+            return
+        try:
+            self.commands.put_nowait(commands)
+        except queue.Full:
+            self.rejected += 1
+            client.send(self._encode({'error': "File de commandes pleine, commande ignorée"}))
+
+    @staticmethod
+    def _parse_command(command: dict) -> dict:
+        parsed = {'id': _parse_id(command['id'])}
+        for field, value in command.items():
+            if field != 'id':
+                if field not in COMMAND_FIELDS:
+                    raise KeyError(field)
+                parsed[field] = COMMAND_FIELDS[field](value)
+        return parsed
+
+    @staticmethod
+    def _encode(message: dict) -> bytes:
+        return (json.dumps(message) + '\n').encode()
+
+    def apply_commands(self, robots: list) -> int:
+        """
+        Applique aux robots toutes les commandes reçues depuis l'appel précédent, dans l'ordre.
+
+        Returns:
+            int: Nombre de commandes de robot appliquées (identifiants inconnus ignorés)
+        """
+        applied = 0
+        while True:
+            try:
+                commands = self.commands.get_nowait()
+            except queue.Empty:
+                return applied
+            for command in commands:
+                if not 0 <= command['id'] < len(robots):
+                    continue
+                robot = robots[command['id']]
+                if 'steering' in command:
+                    robot.steering_override = command['steering']
+                for gain in ('kp', 'ki', 'kd'):
+                    if gain in command:
+                        setattr(robot.pid, gain, command[gain])
+                if command.get('reset'):
+                    robot.reset()
+                applied += 1
+
+    def publish(self, tick: int, robots: list):
+        """Envoie l'état des robots à tous les clients (sans effet s'il n'y en a aucun)."""
+        if not self._clients:
+            return
+        state = {
+            'tick': tick,
+            'robots': [{'id': i, 'name': robot.name, 'x': robot.x, 'y': robot.y, 'angle': robot.angle,
+                        'sensors': list(robot.sensor_values), 'error': robot.current_error,
+                        'output': robot.pid_output}
+                       for i, robot in enumerate(robots)],
+        }
+        self._loop.call_soon_threadsafe(self._broadcast, state)
+
+    def _broadcast(self, state: dict):
+        """Dans le thread du serveur : sérialise l'état une fois et le met en file pour chaque client."""
+        line = self._encode(state)
+        for client in self._clients:
+            client.send(line)
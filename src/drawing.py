@@ -0,0 +1,121 @@
+"""
+Dessin des robots et de la piste avec pygame.
+
+Ce module n'est chargé qu'au premier affichage (``Robot.draw``, ``Track.draw_track``) :
+le cœur de la simulation (PID, cinématique, géométrie de la piste) s'importe sans pygame.
+"""
+import math
+import pygame
+from configuration.colors import BLUE, GRAY, GREEN, LINE_COLOR, RED, YELLOW
+from src.sprites import quantize_angle, rotated_body, rotated_wheel
+
+
+def draw_robot(screen: pygame.Surface, robot, alpha: float = 1.0) -> pygame.Rect:
+    """
+    Dessine un robot, sa trajectoire, ses capteurs et ses flèches de direction.
+
+    ``alpha`` interpole la pose entre le pas de physique précédent (0) et le courant (1).
+
+    Returns:
+        pygame.Rect: Rectangle englobant la zone dessinée (pour les mises à jour partielles)
+    """
+    x, y, heading = robot.interpolated_pose(alpha)
+    # Zone couverte par le robot et ses flèches (la plus longue mesure robot.height)
+    reach = robot.height + 4
+    dirty = pygame.Rect(int(x) - reach, int(y) - reach, 2 * reach, 2 * reach)
+
+    # Trajectoire ou Chemin parcouru (sous le robot)
+    if len(robot.path_history) > 1:
+        dirty.union_ip(pygame.draw.lines(screen, robot.color, False, robot.path_history.view(), 2))
+    pygame.draw.circle(screen, robot.color, (int(x), int(y)), 8)
+
+    # Corps du robot : sprite tourné mis en cache par angle quantifié
+    angle = quantize_angle(heading)
+    rotated_robot = rotated_body(tuple(robot.color), robot.width, robot.height, angle)
+    rect = rotated_robot.get_rect(center=(x, y))
+
+    # Affichage
+    screen.blit(rotated_robot, rect.topleft)
+
+    # Dessiner les roues arrière
+    wheel_width = int(robot.width * 0.2)
+    wheel_height = int(robot.height * 0.4)
+
+    # Position des roues
+    wheel_offset_x = robot.width * 0.6
+    wheel_offset_y = robot.height * 0.3
+    cos_a = math.cos(math.radians(-heading))
+    sin_a = math.sin(math.radians(-heading))
+
+    # Roue gauche
+    wheel_x_l = x - wheel_offset_x * cos_a + wheel_offset_y * sin_a
+    wheel_y_l = y - wheel_offset_x * sin_a - wheel_offset_y * cos_a
+
+    # Roue droite
+    wheel_x_r = x + wheel_offset_x * cos_a + wheel_offset_y * sin_a
+    wheel_y_r = y + wheel_offset_x * sin_a - wheel_offset_y * cos_a
+
+    # Sprite de roue tourné (le même pour les deux roues)
+    rotated_wheel_surface = rotated_wheel(wheel_width, wheel_height, angle)
+
+    # Trouver les nouvelles positions après rotation
+    rect_l = rotated_wheel_surface.get_rect(center=(wheel_x_l, wheel_y_l))
+    rect_r = rotated_wheel_surface.get_rect(center=(wheel_x_r, wheel_y_r))
+
+    # Dessiner les roues sur l'écran
+    screen.blit(rotated_wheel_surface, rect_l)
+    screen.blit(rotated_wheel_surface, rect_r)
+
+
+    # Dessiner la roue avant (simplifiée comme un point pour l'exemple)
+    front_wheel_x = x + robot.width/2 * math.sin(math.radians(heading))
+    front_wheel_y = y + robot.height*0.6/2 * math.cos(math.radians(heading))
+    pygame.draw.circle(screen, GRAY, (int(front_wheel_x), int(front_wheel_y)), 5)
+
+
+    # Capteurs (points)
+    # Dessin des capteurs
+    sensor_positions = robot.sensor_positions_at(x, y, heading)
+    # Calcul de l'erreur pondérée
+    for i in range(len(sensor_positions)):
+        # Debugging: Check the type and value of `i`
+        pos= sensor_positions[i]
+        sensor_value = int(robot.sensor_values[i])
+
+        # Define color based on sensor value thresholds
+        if sensor_value < 256:
+            color = BLUE  # Assuming BLUE is defined
+        elif 256 <= sensor_value < 512:
+            color = YELLOW  # Assuming YELLOW is defined
+        elif 512 <= sensor_value < 768:
+            color = GREEN
+        else:
+            color = RED
+        pygame.draw.circle(screen, color, (int(pos[0]), int(pos[1])), 3)
+
+
+    # Direction (flèche)
+    arrow_length = robot.height
+    arrow_end_x = x + arrow_length * math.sin(math.radians(heading))
+    arrow_end_y = y + arrow_length * math.cos(math.radians(heading))
+    pygame.draw.line(screen, robot.color, (x, y), (arrow_end_x, arrow_end_y), 1)
+
+    # Draw direction arrow proportional to PID correction
+    arrow_length = abs(robot.pid.last_error) * 0.05
+    arrow_end_x = x + arrow_length * math.cos(math.radians(math.radians(heading)))
+    arrow_end_y = y + arrow_length * math.sin(math.radians(math.radians(heading)))
+    pygame.draw.line(screen, RED, (x, y), (arrow_end_x, arrow_end_y), 2)
+
+    # flèche PID
+    dx = math.sin(math.radians(heading+robot.pid_output)) * 20
+    dy = math.cos(math.radians(heading-robot.pid_output)) * 20
+    pygame.draw.line(screen, GREEN, (x, y), (x + dx, y + dy), 2)
+    return dirty
+
+
+def draw_track(screen: pygame.Surface, track):
+    """Dessine la ligne épaisse de la piste."""
+    points = track.points
+    if len(points) > 1:
+        for i in range(len(points) - 1):
+            pygame.draw.line(screen, LINE_COLOR, points[i], points[i + 1], track.line_width)
@@ -0,0 +1,344 @@
+import math
+import numpy as np
+
+# Nombre maximal de couples (point, segment) évalués en une seule passe NumPy
+MAX_PAIRS_PER_CHUNK = 1_000_000
+
+
+def distances_to_polyline(points, track_points) -> np.ndarray:
+    """
+    Calcule, par broadcasting NumPy, la distance minimale entre des points et une polyligne.
+
+    Même calcul que ``Robot.distance_point_to_segment`` appliqué à tous les segments,
+    mais pour tous les capteurs de tous les robots en un seul appel.
+
+    Args:
+        points: Tableau (..., 2) de positions (ex. (n_robots, n_capteurs, 2))
+        track_points: Points de la piste, tableau (n_points, 2)
+
+    Returns:
+        np.ndarray: Distances de forme (...), ``inf`` si la piste a moins de 2 points
+    """
+    return nearest_segments(points, track_points)[0]
+
+
+def project_onto_segments(points, starts, ends) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Projette des points sur des segments (tableaux (..., 2) diffusables entre eux).
+
+    Returns:
+        tuple: (distances, paramètres t dans [0, 1] des projections)
+    """
+    x, y = points[..., 0], points[..., 1]
+    x1, y1 = starts[..., 0], starts[..., 1]
+    dx, dy = ends[..., 0] - x1, ends[..., 1] - y1
+
+    # Longueur du segment au carré (un segment réduit à un point donne t = 0)
+    segment_length_squared = dx ** 2 + dy ** 2
+    safe_length = np.where(segment_length_squared == 0, 1.0, segment_length_squared)
+
+    # Projection du point sur le segment, bornée à [0, 1]
+    t = ((x - x1) * dx + (y - y1) * dy) / safe_length
+    t = np.where(segment_length_squared == 0, 0.0, np.clip(t, 0, 1))
+    projection_x = x1 + t * dx
+    projection_y = y1 + t * dy
+    return np.sqrt((x - projection_x) ** 2 + (y - projection_y) ** 2), t
+
+
+def nearest_segments(points, track_points) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Distance minimale et indice du segment le plus proche, pour chaque point.
+
+    Returns:
+        tuple: (distances de forme (...), indices de forme (...)) ; ``(inf, -1)``
+        si la piste a moins de 2 points
+    """
+    points = np.asarray(points, dtype=float)
+    track_points = np.asarray(track_points, dtype=float).reshape(-1, 2)
+    shape = points.shape[:-1]
+    flat = points.reshape(-1, 1, 2)
+    best = np.full(flat.shape[0], np.inf)
+    best_index = np.full(flat.shape[0], -1)
+    if len(track_points) < 2 or flat.shape[0] == 0:
+        return best.reshape(shape), best_index.reshape(shape)
+
+    starts, ends = track_points[:-1], track_points[1:]
+    chunk = max(1, MAX_PAIRS_PER_CHUNK // flat.shape[0])
+    for k in range(0, len(starts), chunk):
+        distances, _ = project_onto_segments(flat, starts[k:k + chunk], ends[k:k + chunk])
+        index = distances.argmin(axis=1)
+        chunk_best = distances[np.arange(len(index)), index]
+        closer = chunk_best < best
+        best = np.where(closer, chunk_best, best)
+        best_index = np.where(closer, index + k, best_index)
+    return best.reshape(shape), best_index.reshape(shape)
+
+
+def distance_point_to_segment(x: float, y: float, x1: float, y1: float, x2: float, y2: float) -> float:
+    """Distance entre le point (x, y) et le segment [(x1, y1), (x2, y2)]."""
+    # Calculer la longueur du segment au carré
+    segment_length_squared = (x2 - x1) ** 2 + (y2 - y1) ** 2
+
+    # Si le segment est un point, retourner la distance entre les deux points
+    if segment_length_squared == 0:
+        return math.sqrt((x - x1) ** 2 + (y - y1) ** 2)
+
+    # Projection du point sur le segment, bornée à [0, 1]
+    t = max(0, min(1, ((x - x1) * (x2 - x1) + (y - y1) * (y2 - y1)) / segment_length_squared))
+    projection_x = x1 + t * (x2 - x1)
+    projection_y = y1 + t * (y2 - y1)
+    return math.sqrt((x - projection_x) ** 2 + (y - projection_y) ** 2)
+
+
+class SegmentGrid:
+    """
+    Index spatial (grille uniforme) des segments d'une polyligne.
+
+    Chaque segment est rangé dans les cellules couvertes par sa boîte englobante.
+    Une requête parcourt les cellules par anneaux autour du point et s'arrête dès
+    que les anneaux restants ne peuvent plus contenir de segment plus proche.
+    """
+
+    def __init__(self, track_points, cell_size: float = None):
+        points = [(float(x), float(y)) for x, y in track_points]
+        self.segments = [(a[0], a[1], b[0], b[1]) for a, b in zip(points[:-1], points[1:])]
+        self.cells = {}
+        if not self.segments:
+            self.min_x = self.min_y = 0.0
+            self.cell_size = 1.0
+            self.cols = self.rows = 1
+            return
+
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self.min_x, self.min_y = min(xs), min(ys)
+        span_x, span_y = max(xs) - self.min_x, max(ys) - self.min_y
+
+        # Taille de cellule : longueur moyenne des segments, bornée pour limiter le nombre de cellules
+        if cell_size is None:
+            lengths = [math.hypot(x2 - x1, y2 - y1) for x1, y1, x2, y2 in self.segments]
+            cell_size = sum(lengths) / len(lengths)
+            max_cells = 4 * len(self.segments) + 16
+            cell_size = max(cell_size, math.sqrt(span_x * span_y / max_cells), 1.0)
+        self.cell_size = cell_size
+        self.cols = int(span_x // cell_size) + 1
+        self.rows = int(span_y // cell_size) + 1
+
+        for i, (x1, y1, x2, y2) in enumerate(self.segments):
+            c0, r0 = self._cell(min(x1, x2), min(y1, y2))
+            c1, r1 = self._cell(max(x1, x2), max(y1, y2))
+            for c in range(c0, c1 + 1):
+                for r in range(r0, r1 + 1):
+                    self.cells.setdefault((c, r), []).append(i)
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        """Cellule contenant (x, y), ramenée dans les bornes de la grille."""
+        c = int((x - self.min_x) // self.cell_size)
+        r = int((y - self.min_y) // self.cell_size)
+        return min(max(c, 0), self.cols - 1), min(max(r, 0), self.rows - 1)
+
+    def _ring(self, c: int, r: int, k: int):
+        """Cellules (dans la grille) à distance de Tchebychev exactement k de (c, r)."""
+        if k == 0:
+            yield c, r
+            return
+        c_min, c_max = max(c - k, 0), min(c + k, self.cols - 1)
+        for row in (r - k, r + k):
+            if 0 <= row < self.rows:
+                for col in range(c_min, c_max + 1):
+                    yield col, row
+        for col in (c - k, c + k):
+            if 0 <= col < self.cols:
+                for row in range(max(r - k + 1, 0), min(r + k - 1, self.rows - 1) + 1):
+                    yield col, row
+
+    def nearest(self, x: float, y: float, max_distance: float = None) -> tuple[float, int]:
+        """
+        Segment le plus proche du point (x, y).
+
+        Avec ``max_distance``, la recherche s'arrête au-delà de cette distance : le
+        résultat est exact s'il est inférieur à ``max_distance``, et vaut
+        ``(max_distance, -1)`` si aucun segment n'est plus proche.
+
+        Returns:
+            tuple: (distance, indice du segment), ``(inf, -1)`` si la polyligne est vide
+        """
+        best, best_index = float('inf'), -1
+        if not self.segments:
+            return best, best_index
+        c, r = self._cell(x, y)
+        max_ring = max(c, self.cols - 1 - c, r, self.rows - 1 - r)
+        seen = set()
+        for k in range(max_ring + 1):
+            for cell in self._ring(c, r, k):
+                for i in self.cells.get(cell, ()):
+                    if i in seen:
+                        continue
+                    seen.add(i)
+                    distance = distance_point_to_segment(x, y, *self.segments[i])
+                    if distance < best:
+                        best, best_index = distance, i
+            # Tout segment non visité est à au moins k cellules du point
+            if best <= k * self.cell_size:
+                break
+            if max_distance is not None and k * self.cell_size >= max_distance:
+                break
+        if max_distance is not None and best >= max_distance:
+            return max_distance, -1
+        return best, best_index
+
+
+def bake_distance_field(track_points, width: float, height: float, resolution: float = 1.0,
+                        max_distance: float = None) -> np.ndarray:
+    """
+    Calcule une carte de distance (float32) à la polyligne sur la zone [0, width] x [0, height].
+
+    Le nœud (i, j) de la grille correspond au point (j * resolution, i * resolution).
+    Avec ``max_distance``, seules les bandes autour de chaque segment sont calculées
+    et les distances sont plafonnées à cette valeur (utile pour les longues pistes).
+
+    Returns:
+        np.ndarray: Grille de forme (rows, cols)
+    """
+    cols = int(width / resolution) + 1
+    rows = int(height / resolution) + 1
+    track_points = np.asarray(track_points, dtype=float).reshape(-1, 2)
+    xs = np.arange(cols) * resolution
+    ys = np.arange(rows) * resolution
+
+    if max_distance is None:
+        field = np.empty((rows, cols), dtype=np.float32)
+        rows_per_chunk = max(1, MAX_PAIRS_PER_CHUNK // (cols * max(1, len(track_points) - 1)))
+        for i in range(0, rows, rows_per_chunk):
+            grid_x, grid_y = np.meshgrid(xs, ys[i:i + rows_per_chunk])
+            chunk = np.stack((grid_x, grid_y), axis=-1)
+            field[i:i + rows_per_chunk] = distances_to_polyline(chunk, track_points)
+        return field
+
+    # Mise à jour par fenêtre : chaque segment ne touche que sa boîte englobante élargie
+    field = np.full((rows, cols), max_distance, dtype=np.float32)
+    for start, end in zip(track_points[:-1], track_points[1:]):
+        low = np.minimum(start, end) - max_distance
+        high = np.maximum(start, end) + max_distance
+        j0, i0 = np.maximum(np.ceil(low / resolution).astype(int), 0)
+        j1, i1 = np.floor(high / resolution).astype(int) + 1
+        j1, i1 = min(j1, cols), min(i1, rows)
+        if j0 >= j1 or i0 >= i1:
+            continue
+        grid_x, grid_y = np.meshgrid(xs[j0:j1], ys[i0:i1])
+        window = distances_to_polyline(np.stack((grid_x, grid_y), axis=-1), (start, end))
+        np.minimum(field[i0:i1, j0:j1], window, out=field[i0:i1, j0:j1])
+    return field
+
+
+def sample_distance_field(field: np.ndarray, resolution: float, points) -> np.ndarray:
+    """
+    Échantillonne une carte de distance par interpolation bilinéaire.
+
+    Returns:
+        np.ndarray: Distances de forme (...), ``nan`` pour les points hors de la grille
+    """
+    points = np.asarray(points, dtype=float)
+    rows, cols = field.shape
+    fx = points[..., 0] / resolution
+    fy = points[..., 1] / resolution
+    inside = (fx >= 0) & (fx <= cols - 1) & (fy >= 0) & (fy <= rows - 1)
+
+    j0 = np.clip(np.floor(np.nan_to_num(fx)), 0, max(cols - 2, 0)).astype(int)
+    i0 = np.clip(np.floor(np.nan_to_num(fy)), 0, max(rows - 2, 0)).astype(int)
+    j1 = np.minimum(j0 + 1, cols - 1)
+    i1 = np.minimum(i0 + 1, rows - 1)
+    tx = np.clip(fx - j0, 0, 1)
+    ty = np.clip(fy - i0, 0, 1)
+
+    top = field[i0, j0] * (1 - tx) + field[i0, j1] * tx
+    bottom = field[i1, j0] * (1 - tx) + field[i1, j1] * tx
+    values = top * (1 - ty) + bottom * ty
+    return np.where(inside, values, np.nan)
+
+
+def remove_duplicate_points(points) -> np.ndarray:
+    """Supprime les points consécutifs confondus (segments de longueur nulle)."""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) < 2:
+        return points
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(np.diff(points, axis=0) != 0, axis=1)
+    return points[keep]
+
+
+def arc_length(points) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Longueurs des segments et abscisse curviligne cumulée d'une polyligne.
+
+    Returns:
+        tuple: (longueurs des n-1 segments, abscisse des n points, 0 au premier point)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    segment_lengths = np.hypot(*np.diff(points, axis=0).T) if len(points) > 1 else np.zeros(0)
+    cumulative = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+    return segment_lengths, cumulative
+
+
+def smooth_polyline(points, method: str = 'catmull-rom', samples_per_segment: int = 8,
+                    closed: bool = False) -> np.ndarray:
+    """
+    Lisse une polyligne par une spline cubique uniforme, évaluée en bloc avec NumPy.
+
+    - ``'catmull-rom'`` passe par tous les points de contrôle ;
+    - ``'bspline'`` (B-spline cubique) est plus lisse mais ne passe que par les extrémités.
+
+    Args:
+        points: Points de contrôle (n, 2)
+        method (str): 'catmull-rom' ou 'bspline'
+        samples_per_segment (int): Nombre de points générés entre deux points de contrôle
+        closed (bool): Courbe fermée (le dernier point rejoint le premier)
+
+    Returns:
+        np.ndarray: Points de la courbe lissée (m, 2)
+    """
+    points = remove_duplicate_points(points)
+    if closed and len(points) > 2 and np.array_equal(points[0], points[-1]):
+        points = points[:-1]
+    if len(points) < 3:
+        return points
+
+    if closed:
+        padded = np.concatenate((points[-1:], points, points[:2]))
+    elif method == 'bspline':
+        # Extrémités triplées : la courbe commence et finit sur les points extrêmes
+        padded = np.concatenate((points[:1], points[:1], points, points[-1:], points[-1:]))
+    else:
+        padded = np.concatenate((points[:1], points, points[-1:]))
+
+    # Fenêtres de 4 points de contrôle (une par segment de courbe)
+    p0, p1, p2, p3 = (padded[k:len(padded) - 3 + k, None, :] for k in range(4))
+    t = (np.arange(samples_per_segment) / samples_per_segment)[None, :, None]
+    t2, t3 = t * t, t * t * t
+    if method == 'catmull-rom':
+        curve = 0.5 * (2 * p1 + (p2 - p0) * t + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2
+                       + (3 * p1 - p0 - 3 * p2 + p3) * t3)
+        end = p2[-1]
+    elif method == 'bspline':
+        curve = ((1 - t) ** 3 * p0 + (3 * t3 - 6 * t2 + 4) * p1
+                 + (-3 * t3 + 3 * t2 + 3 * t + 1) * p2 + t3 * p3) / 6
+        end = (p1[-1] + 4 * p2[-1] + p3[-1]) / 6
+    else:
+        raise ValueError(f"Méthode de lissage inconnue : {method}")
+    return np.concatenate((curve.reshape(-1, 2), end.reshape(1, 2)))
+
+
+def resample_polyline(points, spacing: float) -> np.ndarray:
+    """
+    Rééchantillonne une polyligne à pas constant en abscisse curviligne.
+
+    Le premier et le dernier point sont conservés ; le pas réel est le plus proche
+    de ``spacing`` qui divise exactement la longueur totale.
+    """
+    points = remove_duplicate_points(points)
+    if len(points) < 2:
+        return points
+    _, cumulative = arc_length(points)
+    count = max(1, int(math.ceil(cumulative[-1] / spacing)))
+    s = np.linspace(0.0, cumulative[-1], count + 1)
+    return np.stack((np.interp(s, cumulative, points[:, 0]), np.interp(s, cumulative, points[:, 1])), axis=-1)
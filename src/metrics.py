@@ -0,0 +1,107 @@
+import numpy as np
+from configuration.robot import ROBOT_HEIGHT, ROBOT_WIDTH
+from src.track import Track
+
+
+def trajectory_metrics(x, y, track: Track, settle_threshold: float = None,
+                       finish_radius: float = ROBOT_HEIGHT / 2, lost_distance: float = ROBOT_WIDTH) -> dict:
+    """
+    Calcule les métriques de suivi de ligne à partir de trajectoires.
+
+    L'écart latéral (cross-track error) est la distance entre le centre du robot et sa
+    projection sur la piste, suivie tick après tick (``project_trajectory``).
+    Les métriques ne portent que sur les ticks précédant l'arrivée (passage à moins de
+    ``finish_radius`` du dernier point de la piste).
+
+    Args:
+        x, y: Trajectoires de forme (ticks, n_robots)
+        track (Track): Piste suivie
+        settle_threshold (float): Écart latéral toléré pour le temps d'établissement
+            (par défaut la demi-largeur de ligne)
+        finish_radius (float): Rayon autour du dernier point qui valide le tour
+        lost_distance (float): Écart latéral au-delà duquel le robot a perdu la ligne :
+            la progression n'est plus comptée à partir de ce tick (un robot perdu
+            se projette n'importe où sur la piste, par exemple sur son dernier segment)
+
+    Returns:
+        dict: Tableaux de taille n_robots : 'rms_cte', 'max_cte', 'settling_tick'
+        (nan si jamais établi), 'completed', 'completion_tick' et 'progress'
+        (fraction de la longueur de la piste atteinte avant de perdre la ligne)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    ticks = x.shape[0]
+    if settle_threshold is None:
+        settle_threshold = track.line_width / 2
+
+    progress, lateral = project_trajectory(x, y, track)
+    cte = np.abs(lateral)
+
+    # Arrivée : premier passage près du dernier point de la piste
+    end_x, end_y = track.get_track_points()[-1]
+    finished = np.hypot(x - end_x, y - end_y) <= finish_radius
+    completed = finished.any(axis=0)
+    completion_tick = np.where(completed, finished.argmax(axis=0) + 1, ticks)
+    valid = np.arange(ticks)[:, None] < completion_tick
+    count = np.maximum(valid.sum(axis=0), 1)
+
+    rms_cte = np.sqrt(np.where(valid, cte ** 2, 0).sum(axis=0) / count)
+    max_cte = np.where(valid, cte, 0).max(axis=0)
+
+    # Temps d'établissement : tick après le dernier dépassement du seuil
+    above = (cte > settle_threshold) & valid
+    last_above = ticks - 1 - above[::-1].argmax(axis=0)
+    settling_tick = np.where(above.any(axis=0), last_above + 1, 0).astype(float)
+    settling_tick[settling_tick >= completion_tick] = np.nan
+
+    # Progression : jusqu'au premier tick où le robot a perdu la ligne
+    lost = (cte > lost_distance) & valid
+    first_lost = np.where(lost.any(axis=0), lost.argmax(axis=0), ticks)
+    on_line = valid & (np.arange(ticks)[:, None] < first_lost)
+    length = track.get_length()
+    reached = np.where(on_line, progress, 0).max(axis=0) if ticks else np.zeros(x.shape[1:])
+    progress_ratio = reached / length if length else np.zeros_like(reached)
+
+    return {
+        'rms_cte': rms_cte,
+        'max_cte': max_cte,
+        'settling_tick': settling_tick,
+        'completed': completed,
+        'completion_tick': completion_tick,
+        'progress': progress_ratio,
+    }
+
+
+def project_trajectory(x, y, track: Track) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Abscisse curviligne et écart latéral signé le long de trajectoires (ticks, n_robots).
+
+    Chaque tick repart des segments trouvés au tick précédent (``Track.project_many``),
+    ce qui suit la progression de chaque robot sans recherche globale.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    s = np.empty(x.shape)
+    lateral = np.empty(x.shape)
+    hints = None
+    for t in range(x.shape[0]):
+        s[t], lateral[t], _, hints = track.project_many(np.stack((x[t], y[t]), axis=-1), hints)
+    return s, lateral
+
+
+def lap_ticks(s, track_length: float) -> list:
+    """
+    Ticks de fin de tour sur une piste fermée, pour chaque robot.
+
+    Un tour est compté quand l'abscisse curviligne repasse de la fin de la piste
+    (dernier quart) à son début (premier quart).
+
+    Args:
+        s: Abscisses curvilignes de forme (ticks, n_robots)
+
+    Returns:
+        list: Pour chaque robot, la liste des ticks (1-indexés) de fin de tour
+    """
+    s = np.asarray(s, dtype=float)
+    wrapped = (s[:-1] > 0.75 * track_length) & (s[1:] < 0.25 * track_length)
+    return [(np.flatnonzero(wrapped[:, j]) + 2).tolist() for j in range(s.shape[1])]
@@ -0,0 +1,195 @@
+"""
+Évaluation Monte-Carlo de la robustesse des gains PID, sans affichage.
+
+Chaque jeu de gains est simulé sur ``runs`` tirages perturbés : bruit des capteurs IR,
+retard de lecture des capteurs, perturbation de la direction et pose de départ décalée.
+Les tirages d'un même jeu de gains forment un seul ``RobotSwarm`` (un robot par tirage).
+
+Exemple :
+    python -m src.montecarlo --kp 0.1,0.2 --ki 0 --kd 0:1:5 --runs 500 -o robustness.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.metrics import trajectory_metrics
+from src.parallel import default_chunk_size
+from src.swarm import RobotSwarm
+from src.sweep import DEFAULT_POSE, parse_range
+from src.track import Track
+
+# Amplitude des perturbations par défaut
+PERTURBATIONS = {
+    'sensor_noise': 30.0,     # écart type du bruit ajouté aux lectures IR (unités capteur, 99-1024)
+    'latency': 1,             # retard maximal des lectures en ticks (tiré uniformément dans 0..latency)
+    'actuator_noise': 0.5,    # écart type de la perturbation de l'angle à chaque tick (degrés)
+    'pose_offset': 5.0,       # écart type du décalage de la position de départ (pixels)
+    'pose_angle': 5.0,        # écart type du décalage de l'angle de départ (degrés)
+}
+PERCENTILES = (50, 90, 95, 99)
+
+RESULT_FIELDS = (['kp', 'ki', 'kd', 'runs', 'completion_rate', 'score', 'progress_p5']
+                 + [f'{metric}_p{q}' for metric in ('rms_cte', 'max_cte', 'mean_abs_error') for q in PERCENTILES])
+
+
+def draw_perturbations(runs: int, ticks: int, n_sensors: int, seed: int = 0, **amplitudes) -> dict:
+    """
+    Tire les perturbations de chaque exécution.
+
+    L'exécution i a son propre générateur, issu de ``SeedSequence(seed).spawn(runs)[i]`` :
+    ses tirages ne dépendent ni du nombre d'exécutions ni des autres jeux de gains, qui
+    sont tous évalués sur les mêmes perturbations (comparaison à aléas communs).
+
+    Returns:
+        dict: 'pose' (runs, 3), 'latency' (runs,), 'sensor_noise' (ticks, runs, n_sensors)
+        et 'actuator_noise' (ticks, runs)
+    """
+    amplitudes = {**PERTURBATIONS, **amplitudes}
+    pose = np.empty((runs, 3))
+    latency = np.empty(runs, dtype=int)
+    sensor_noise = np.empty((ticks, runs, n_sensors))
+    actuator_noise = np.empty((ticks, runs))
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(runs)):
+        rng = np.random.default_rng(child)
+        pose[i] = rng.normal(0.0, 1.0, 3) * [amplitudes['pose_offset'], amplitudes['pose_offset'],
+                                              amplitudes['pose_angle']]
+        latency[i] = rng.integers(0, int(amplitudes['latency']) + 1)
+        sensor_noise[:, i] = rng.normal(0.0, amplitudes['sensor_noise'], (ticks, n_sensors))
+        actuator_noise[:, i] = rng.normal(0.0, amplitudes['actuator_noise'], ticks)
+    return {'pose': pose, 'latency': latency, 'sensor_noise': sensor_noise, 'actuator_noise': actuator_noise}
+
+
+def simulate(gains: tuple, perturbations: dict, track: Track = None, pose: tuple = DEFAULT_POSE,
+             speed: float = 2.0) -> dict:
+    """
+    Simule un jeu de gains (kp, ki, kd) sous toutes les perturbations tirées, en un seul essaim.
+
+    Les lectures bruitées sont écrêtées à la plage des capteurs (99-1024) puis
+    transmises au PID avec le retard propre à chaque exécution.
+
+    Returns:
+        dict: Tableaux (ticks, runs) 'x', 'y' et 'error'
+    """
+    track = track if track is not None else Track()
+    ticks, runs, _ = perturbations['sensor_noise'].shape
+    kp, ki, kd = gains
+    start = np.asarray(pose, dtype=float) + perturbations['pose']
+    swarm = RobotSwarm(runs, start_x=start[:, 0], start_y=start[:, 1], theta=start[:, 2],
+                       kp=kp, ki=ki, kd=kd, speed=speed)
+
+    # Lectures des derniers ticks, indexées modulo (retard maximal + 1)
+    latency = perturbations['latency']
+    depth = int(latency.max()) + 1
+    readings = np.empty((depth, runs, len(swarm.sensor_positions_local)))
+    robots = np.arange(runs)
+
+    trace = {key: np.empty((ticks, runs)) for key in ('x', 'y', 'error')}
+    for t in range(ticks):
+        noisy = swarm.get_sensor_values(track) + perturbations['sensor_noise'][t]
+        readings[t % depth] = np.clip(np.trunc(noisy), 99, 1024)
+        delayed = readings[np.maximum(t - latency, 0) % depth, robots]
+        swarm.step(track, sensor_values=delayed)
+        swarm.angle += perturbations['actuator_noise'][t]
+        trace['x'][t] = swarm.x
+        trace['y'][t] = swarm.y
+        trace['error'][t] = swarm.current_error
+    return trace
+
+
+def evaluate(gains: tuple, runs: int = 200, ticks: int = 1000, seed: int = 0, **amplitudes) -> dict:
+    """
+    Statistiques de robustesse d'un jeu de gains sur ``runs`` exécutions perturbées.
+
+    Le score est le 95e centile de l'écart latéral RMS, les exécutions qui ne terminent
+    pas la piste comptant pour un écart infini : il reste infini si plus de 5 % échouent.
+    Plus il est bas, plus le réglage est robuste.
+
+    Returns:
+        dict: Une ligne de résultats (colonnes RESULT_FIELDS)
+    """
+    track = Track()
+    n_sensors = len(RobotSwarm(1).sensor_positions_local)
+    perturbations = draw_perturbations(runs, ticks, n_sensors, seed, **amplitudes)
+    trace = simulate(gains, perturbations, track)
+    metrics = trajectory_metrics(trace['x'], trace['y'], track)
+
+    completed = metrics['completed']
+    rms_cte = np.where(completed, metrics['rms_cte'], np.inf)
+    per_run = {
+        'rms_cte': metrics['rms_cte'],
+        'max_cte': metrics['max_cte'],
+        'mean_abs_error': np.abs(trace['error']).mean(axis=0),
+    }
+    row = dict(zip(('kp', 'ki', 'kd'), gains))
+    row.update({
+        'runs': runs,
+        'completion_rate': float(completed.mean()),
+        # Centiles sans interpolation : une valeur observée (éventuellement infinie)
+        'score': float(np.percentile(rms_cte, 95, method='higher')),
+        'progress_p5': float(np.percentile(metrics['progress'], 5)),
+    })
+    for metric, values in per_run.items():
+        for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            row[f'{metric}_p{q}'] = float(value)
+    return row
+
+
+def _evaluate(args: tuple) -> dict:
+    gains, runs, ticks, seed, amplitudes = args
+    return evaluate(gains, runs, ticks, seed, **amplitudes)
+
+
+def robustness(kp_values, ki_values, kd_values, runs: int = 200, ticks: int = 1000, seed: int = 0,
+               workers: int = None, **amplitudes) -> list:
+    """
+    Évalue toutes les combinaisons de gains, réparties sur les cœurs avec un ``ProcessPoolExecutor``.
+
+    Returns:
+        list: Une ligne de résultats par jeu de gains, du plus robuste au moins robuste
+    """
+    tasks = [((kp, ki, kd), runs, ticks, seed, amplitudes)
+             for kp, ki, kd in itertools.product(kp_values, ki_values, kd_values)]
+    if workers == 1 or len(tasks) <= 1:
+        rows = [_evaluate(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_evaluate, tasks, chunksize=default_chunk_size(len(tasks), workers)))
+    return sorted(rows, key=lambda r: (r['score'], -r['completion_rate']))
+
+
+def write_results(rows: list, path: str):
+    """Écrit le tableau de résultats au format CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Robustesse Monte-Carlo des gains PID sur la piste Moose Test")
+    parser.add_argument('--kp', type=parse_range, default=parse_range('0.1,0.2'))
+    parser.add_argument('--ki', type=parse_range, default=parse_range('0'))
+    parser.add_argument('--kd', type=parse_range, default=parse_range('0.1,1'))
+    parser.add_argument('--runs', type=int, default=200, help="Exécutions perturbées par jeu de gains")
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    for name, value in PERTURBATIONS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('-o', '--output', default='robustness_results.csv')
+    args = parser.parse_args()
+
+    amplitudes = {name: getattr(args, name) for name in PERTURBATIONS}
+    rows = robustness(args.kp, args.ki, args.kd, args.runs, args.ticks, args.seed, args.workers, **amplitudes)
+    write_results(rows, args.output)
+
+    print(f"{len(rows)} jeux de gains x {args.runs} exécutions -> {args.output}")
+    for r in rows[:5]:
+        print(f"  Kp={r['kp']:.3f} Ki={r['ki']:.5f} Kd={r['kd']:.3f} : score={r['score']:.2f}, "
+              f"arrivée {r['completion_rate']:.0%}, RMS médian={r['rms_cte_p50']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
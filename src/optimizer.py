@@ -0,0 +1,152 @@
+"""
+Optimisation automatique des gains PID (Nelder-Mead) avec arrêt anticipé des candidats perdus.
+
+Exemple :
+    python -m src.optimizer --x0 0.1,0,0.1 --ticks 1000
+"""
+import argparse
+import math
+import numpy as np
+from configuration.robot import ROBOT_HEIGHT, ROBOT_WIDTH
+from src.robot import Robot
+from src.simulation import Simulation
+from src.sweep import DEFAULT_POSE
+from src.track import Track
+
+# Coût ajouté à un candidat abandonné, proportionnel à l'horizon non simulé
+ABORT_COST = 100.0
+
+
+def evaluate_gains(gains, ticks: int = 1000, track: Track = None, pose=DEFAULT_POSE,
+                   max_deviation: float = ROBOT_WIDTH, max_error: float = None,
+                   finish_radius: float = ROBOT_HEIGHT / 2) -> tuple:
+    """
+    Coût d'un jeu de gains (kp, ki, kd) sur la piste, avec arrêt anticipé.
+
+    Le coût est la moyenne du carré de l'erreur normalisée (comme ``PID.error_history``).
+    La simulation s'arrête dès que le robot termine la piste, ou l'abandonne
+    (centre à plus de ``max_deviation`` de la ligne, ou |erreur| > ``max_error``) ;
+    un abandon ajoute ``ABORT_COST`` pondéré par la fraction d'horizon restante.
+
+    Returns:
+        tuple: (coût, nombre de ticks simulés, abandon)
+    """
+    track = track if track is not None else Track()
+    kp, ki, kd = (max(0.0, float(g)) for g in gains)
+    x, y, theta = pose
+    robot = Robot(x, y, kp=kp, ki=ki, kd=kd, theta=theta, record_history=False)
+    end_x, end_y = track.get_track_points()[-1]
+    status = {'aborted': False}
+
+    def stop(simulation):
+        if math.hypot(robot.x - end_x, robot.y - end_y) <= finish_radius:
+            return True
+        lost = track.nearest_distance(robot.x, robot.y) > max_deviation
+        diverged = max_error is not None and abs(robot.pid.last_error) > max_error
+        status['aborted'] = lost or diverged
+        return status['aborted']
+
+    trace = Simulation(track, [robot]).run(ticks, stop=stop)
+    errors = trace['error'][:, 0] / 60
+    simulated = len(errors)
+    cost = float(np.mean(errors ** 2))
+    if status['aborted']:
+        cost += ABORT_COST * (1 + (ticks - simulated) / ticks)
+    return cost, simulated, status['aborted']
+
+
+def nelder_mead(f, x0, step=0.1, max_evals: int = 200, tol: float = 1e-6) -> tuple:
+    """
+    Minimise ``f`` par la méthode du simplexe de Nelder-Mead.
+
+    Returns:
+        tuple: (meilleur point, meilleure valeur, nombre d'évaluations)
+    """
+    x0 = np.asarray(x0, dtype=float)
+    steps = np.broadcast_to(np.asarray(step, dtype=float), x0.shape)
+    simplex = [x0] + [x0 + np.eye(len(x0))[i] * steps[i] for i in range(len(x0))]
+    values = [f(x) for x in simplex]
+    evals = len(simplex)
+
+    while evals < max_evals:
+        order = np.argsort(values)
+        simplex = [simplex[i] for i in order]
+        values = [values[i] for i in order]
+        if abs(values[-1] - values[0]) <= tol:
+            break
+
+        centroid = np.mean(simplex[:-1], axis=0)
+        # Réflexion
+        reflected = centroid + (centroid - simplex[-1])
+        f_reflected = f(reflected)
+        evals += 1
+        if values[0] <= f_reflected < values[-2]:
+            simplex[-1], values[-1] = reflected, f_reflected
+            continue
+        # Expansion
+        if f_reflected < values[0]:
+            expanded = centroid + 2 * (centroid - simplex[-1])
+            f_expanded = f(expanded)
+            evals += 1
+            if f_expanded < f_reflected:
+                simplex[-1], values[-1] = expanded, f_expanded
+            else:
+                simplex[-1], values[-1] = reflected, f_reflected
+            continue
+        # Contraction
+        contracted = centroid + 0.5 * (simplex[-1] - centroid)
+        f_contracted = f(contracted)
+        evals += 1
+        if f_contracted < values[-1]:
+            simplex[-1], values[-1] = contracted, f_contracted
+            continue
+        # Rétrécissement vers le meilleur point
+        for i in range(1, len(simplex)):
+            simplex[i] = simplex[0] + 0.5 * (simplex[i] - simplex[0])
+            values[i] = f(simplex[i])
+            evals += 1
+
+    best = int(np.argmin(values))
+    return simplex[best], values[best], evals
+
+
+def optimize_pid(x0=(0.1, 0.0, 0.1), step=(0.1, 0.01, 0.2), ticks: int = 1000, max_evals: int = 200,
+                 track: Track = None, **evaluate_kwargs) -> dict:
+    """
+    Cherche les gains (kp, ki, kd) minimisant ``evaluate_gains`` sur la piste.
+
+    Returns:
+        dict: 'kp', 'ki', 'kd', 'cost', 'evaluations' et 'simulated_ticks' (total)
+    """
+    track = track if track is not None else Track()
+    simulated = []
+
+    def cost(gains):
+        value, ticks_run, _ = evaluate_gains(gains, ticks, track, **evaluate_kwargs)
+        simulated.append(ticks_run)
+        return value
+
+    best, value, evals = nelder_mead(cost, x0, step, max_evals)
+    kp, ki, kd = (max(0.0, float(g)) for g in best)
+    return {'kp': kp, 'ki': ki, 'kd': kd, 'cost': value,
+            'evaluations': evals, 'simulated_ticks': sum(simulated)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimisation des gains PID (Nelder-Mead)")
+    parser.add_argument('--x0', default='0.1,0,0.1', help="Gains initiaux kp,ki,kd")
+    parser.add_argument('--step', default='0.1,0.01,0.2', help="Pas initial du simplexe")
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--max-evals', type=int, default=200)
+    args = parser.parse_args()
+
+    x0 = [float(v) for v in args.x0.split(',')]
+    step = [float(v) for v in args.step.split(',')]
+    result = optimize_pid(x0, step, args.ticks, args.max_evals)
+    print(f"Kp={result['kp']:.4f} Ki={result['ki']:.5f} Kd={result['kd']:.4f} "
+          f"coût={result['cost']:.4f} ({result['evaluations']} évaluations, "
+          f"{result['simulated_ticks']} ticks simulés)")
+
+
+if __name__ == '__main__':
+    main()
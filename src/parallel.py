@@ -0,0 +1,14 @@
+import math
+import os
+
+
+def default_chunk_size(count: int, workers: int = None) -> int:
+    """
+    Taille de lot donnant environ 4 lots par cœur pour ``count`` tâches.
+
+    Utilisée par les calculs répartis avec un ``ProcessPoolExecutor`` (balayage,
+    Monte-Carlo, variantes d'un point de reprise) : même une petite grille est
+    partagée entre tous les cœurs, avec assez de lots pour équilibrer la charge.
+    """
+    workers = workers or os.cpu_count() or 1
+    return max(1, math.ceil(count / (workers * 4)))
@@ -1,23 +1,28 @@
+from src.ring_buffer import RingBuffer
+
+
 class PID:
     """Contrôleur PID pour le robot"""
 
     def __init__(self, kp: float = 1.0, ki: float = 0.0, kd: float = 0.0, max_history: int = 100):
+        """max_history = 0 désactive l'historique (simulations sans affichage)."""
         self.kp, self.ki, self.kd = kp, ki, kd
         self.integral = 0.0
         # last_error=previous_error C'est la meme
         self.last_error = 0.0
         self.previous_error = 0.0
-        self.error_history = []
-        self.output_history = []
         self.max_history = max_history
+        self.error_history = RingBuffer(max_history)
+        self.output_history = RingBuffer(max_history)
         self.integral_limit = 100.0  # Limite pour éviter le windup
 
-    def compute(self, error: float, sur:float) -> float:
+    def compute(self, error: float, sur:float, dt: float = 1.0) -> float:
         """
         Calcule la sortie PID
 
         Args:
             error (float): Erreur actuelle
+            dt (float): Pas de temps en ticks de référence (1.0 = une image à REFERENCE_HZ)
 
         Returns:
             float: Sortie du contrôleur PID
@@ -27,12 +32,12 @@ class PID:
         p = self.kp * error
 
         # Calcul de l'intégrale avec limitation pour éviter le windup
-        self.integral += error/sur
+        self.integral += error/sur * dt
         self.integral = max(-self.integral_limit, min(self.integral_limit, self.integral))
         i = self.ki * self.integral
 
         # Calcul de la dérivée
-        derivative = (error/sur - self.previous_error)
+        derivative = (error/sur - self.previous_error) / dt
         d = self.kd * derivative
 
         # Sortie PID
@@ -44,10 +49,6 @@ class PID:
 
         # Historique pour affichage
         self.error_history.append(error/sur)
-        if len(self.error_history) > self.max_history:
-            self.error_history.pop(0)
-        if len(self.output_history) > self.max_history:
-            self.output_history.pop(0)
         self.output_history.append(output)
         return output
 
@@ -56,4 +57,5 @@ class PID:
         self.integral = 0.0
         self.previous_error = 0.0
         self.last_error = 0.0
-        self.error_history = []
+        self.error_history.clear()
+        self.output_history.clear()
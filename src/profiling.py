@@ -0,0 +1,117 @@
+import contextlib
+import json
+import time
+import numpy as np
+from src.ring_buffer import RingBuffer
+
+# Phases instrumentées de la boucle principale, dans l'ordre d'affichage
+PHASES = ('events', 'update', 'draw', 'graphs', 'record')
+
+
+class _Section:
+    """Chronomètre réutilisable d'une phase (évite une allocation par mesure)."""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+
+
+class Profiler:
+    """
+    Mesure du temps passé dans chaque phase de la boucle principale.
+
+    Les durées d'une phase sont cumulées sur l'image en cours, puis ``end_frame``
+    range les totaux de l'image dans des tampons circulaires de ``window`` images
+    (statistiques glissantes). Désactivé, ``section`` retourne un contexte vide
+    partagé : le coût se limite à un appel de méthode.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 120):
+        self.enabled = enabled
+        self.window = window
+        self.history = {}
+        self._current = {}
+        self._sections = {}
+        self._null = contextlib.nullcontext()
+        self._frame_start = None
+
+    def section(self, name: str):
+        """Contexte ``with`` mesurant la phase ``name``."""
+        if not self.enabled:
+            return self._null
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def add(self, name: str, seconds: float):
+        """Ajoute une durée à la phase ``name`` pour l'image en cours."""
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def end_frame(self):
+        """Clôt l'image en cours : range les totaux par phase et la durée de l'image."""
+        if not self.enabled:
+            self._frame_start = None
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._current['frame'] = now - self._frame_start
+        self._frame_start = now
+        for name, seconds in self._current.items():
+            buffer = self.history.get(name)
+            if buffer is None:
+                buffer = self.history[name] = RingBuffer(self.window)
+            buffer.append(seconds)
+        self._current = {}
+
+    def toggle(self):
+        """Active ou désactive les mesures (les statistiques repartent de zéro)."""
+        self.enabled = not self.enabled
+        self.reset()
+
+    def reset(self):
+        self.history = {}
+        self._current = {}
+        self._frame_start = None
+
+    def stats(self) -> dict:
+        """
+        Statistiques glissantes par phase, en millisecondes.
+
+        Returns:
+            dict: {phase: {'mean', 'p95', 'max', 'last', 'frames'}}
+        """
+        stats = {}
+        for name, buffer in self.history.items():
+            if not len(buffer):
+                continue
+            values = buffer.view() * 1000
+            stats[name] = {
+                'mean': float(values.mean()),
+                'p95': float(np.percentile(values, 95)),
+                'max': float(values.max()),
+                'last': float(values[-1]),
+                'frames': int(buffer.total),
+            }
+        return stats
+
+    def dump(self, path: str):
+        """Écrit les statistiques et les dernières durées brutes (ms) en JSON."""
+        report = {
+            'window': self.window,
+            'stats': self.stats(),
+            'samples_ms': {name: (buffer.view() * 1000).tolist() for name, buffer in self.history.items()},
+        }
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Profil sauvegardé : {path}")
@@ -0,0 +1,136 @@
+import math
+import os
+import queue
+import sys
+import threading
+import imageio
+import pygame
+
+# Cadence maximale d'un GIF : les délais sont en centièmes de seconde (20 i/s = 5 cs exactement)
+# et beaucoup de lecteurs ralentissent les délais inférieurs à 2 cs
+GIF_MAX_FPS = 20
+
+
+def _is_gif(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() == '.gif'
+
+
+class Recorder:
+    """
+    Enregistreur vidéo/GIF en flux.
+
+    Les images sont copiées (éventuellement réduites) puis placées dans une file
+    bornée ; un thread en arrière-plan les envoie à un writer imageio (MP4 ou GIF
+    selon l'extension). La mémoire reste constante quelle que soit la durée de
+    l'enregistrement et la boucle principale ne bloque jamais : si l'encodeur
+    prend du retard, les images en trop sont ignorées (compteur ``dropped``).
+
+    Une erreur d'encodage (disque plein, codec) termine l'enregistrement sans
+    interrompre la simulation : elle est affichée et gardée dans ``error``.
+    """
+
+    def __init__(self, path: str = 'simulation.gif', fps: int = 24, frame_skip: int = 0,
+                 scale: float = 1.0, queue_size: int = 32):
+        self.path = path
+        self.fps = fps
+        self.frame_skip = frame_skip  # nombre d'images ignorées entre deux images enregistrées
+        self.scale = scale
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._queue = None
+        self._thread = None
+        self._frame_count = 0
+        # Exception levée par le thread d'encodage lors du dernier enregistrement
+        self.error = None
+
+    @classmethod
+    def for_loop(cls, path: str, loop_fps: int, **kwargs) -> "Recorder":
+        """
+        Enregistreur d'une boucle qui appelle ``add_frame`` ``loop_fps`` fois par seconde.
+
+        Le fichier est lu à la vitesse réelle : même cadence que la boucle, sauf
+        pour un GIF, limité à GIF_MAX_FPS en n'enregistrant qu'une image sur N.
+        """
+        frame_skip = 0
+        if _is_gif(path):
+            frame_skip = max(0, math.ceil(loop_fps / GIF_MAX_FPS) - 1)
+        return cls(path, fps=loop_fps / (frame_skip + 1), frame_skip=frame_skip, **kwargs)
+
+    @property
+    def recording(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """Ouvre le writer et démarre le thread d'encodage."""
+        if self.recording:
+            return
+        self.dropped = 0
+        self._frame_count = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        if _is_gif(self.path):
+            # Writer GIF (Pillow) : durée de chaque image en millisecondes, fps ignoré
+            writer = imageio.get_writer(self.path, duration=1000 / self.fps, loop=0)
+        else:
+            writer = imageio.get_writer(self.path, fps=self.fps)
+        self._thread = threading.Thread(target=self._encode, args=(writer, self._queue), daemon=True)
+        self._thread.start()
+
+    def _encode(self, writer, frames: queue.Queue):
+        """Boucle du thread d'encodage : écrit les images jusqu'à la sentinelle None.
+
+        Une erreur d'écriture est gardée dans ``error`` et termine le thread."""
+        try:
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    break
+                writer.append_data(frame)
+        except Exception as error:
+            self.error = error
+        finally:
+            try:
+                writer.close()
+            except Exception as error:
+                if self.error is None:
+                    self.error = error
+
+    def add_frame(self, screen: pygame.Surface):
+        """Ajoute l'image courante sans bloquer (ignorée si la file est pleine)."""
+        if not self.recording:
+            return
+        if not self._thread.is_alive():
+            # Encodeur arrêté sur une erreur : fin de l'enregistrement (erreur signalée par stop)
+            self.stop()
+            return
+        self._frame_count += 1
+        if (self._frame_count - 1) % (self.frame_skip + 1):
+            return
+        if self._queue.full():
+            self.dropped += 1
+            return
+        surface = screen
+        if self.scale != 1.0:
+            size = (max(1, int(screen.get_width() * self.scale)), max(1, int(screen.get_height() * self.scale)))
+            surface = pygame.transform.smoothscale(screen, size)
+        frame = pygame.surfarray.array3d(surface).swapaxes(0, 1)
+        self._queue.put_nowait(frame)
+
+    def stop(self):
+        """Termine l'encodage des images en attente et ferme le fichier (erreur éventuelle dans ``error``)."""
+        if not self.recording:
+            return
+        # Sentinelle de fin, sans bloquer si l'encodeur s'est arrêté (file pleine à jamais)
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        self._thread = None
+        self._queue = None
+        if self.error is not None:
+            print(f"Échec de l'enregistrement {self.path} : {self.error}", file=sys.stderr)
+            return
+        print(f"Enregistrement sauvegardé : {self.path}" + (f" ({self.dropped} images ignorées)" if self.dropped else ""))
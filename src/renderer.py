@@ -0,0 +1,102 @@
+import pygame
+from configuration.colors import *
+from configuration.screen import *
+from src.profiling import Profiler
+from src.track import Track
+from src.visualization import Visualization
+
+
+class Renderer:
+    """
+    Rendu en couches de la simulation.
+
+    - couche statique : fond, piste et informations PID, pré-rendue une seule fois
+      (reconstruite quand les points de la piste ou les gains changent) ;
+    - couches dynamiques : robots puis graphiques PID ;
+    - surcouche : titre, toujours recomposé dans sa propre zone (petite).
+
+    Seuls les rectangles modifiés (zones dynamiques de l'image précédente et de
+    l'image courante, zones du titre) sont envoyés à l'écran avec
+    ``pygame.display.update``.
+
+    Le dessin des robots et des graphiques est mesuré par ``profiler`` ; quand il est
+    actif, ses statistiques sont affichées en surcouche.
+
+    ``track_layer`` (image de la piste, ex. piste peinte lue par ``CameraSensors``)
+    remplace alors le fond et le tracé de la piste.
+    """
+
+    def __init__(self, screen: pygame.Surface, track: Track, viz: Visualization, profiler: Profiler = None,
+                 track_layer: pygame.Surface = None):
+        self.screen = screen
+        self.track = track
+        self.viz = viz
+        self.track_layer = track_layer
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.static_layer = None
+        self._static_key = None
+        self._previous_rects = []
+
+    def invalidate(self):
+        """Force la reconstruction de la couche statique à la prochaine image."""
+        self.static_layer = None
+
+    def _key(self, robots: list, selected: int) -> tuple:
+        """Tout ce dont dépend la couche statique."""
+        return self.track.version, selected, tuple((r.pid.kp, r.pid.ki, r.pid.kd) for r in robots)
+
+    def _build_static_layer(self, robots: list, selected: int):
+        """Dessine fond, piste et informations puis les garde en cache."""
+        self.screen.fill(BACKGROUND)
+        if self.track_layer is not None:
+            self.screen.blit(self.track_layer, (0, 0))
+        else:
+            self.track.draw_track(self.screen)
+        self.viz.draw_info(self.screen, robots, selected)
+        self.static_layer = self.screen.copy()
+        self._static_key = self._key(robots, selected)
+
+    def render(self, robots: list, selected: int = 0, alpha: float = 1.0) -> list:
+        """
+        Compose une image et met à jour l'affichage.
+
+        ``alpha`` interpole la pose des robots entre les deux derniers pas de physique.
+
+        Returns:
+            list: Rectangles envoyés à l'écran (l'écran entier si la couche statique a été reconstruite)
+        """
+        full_redraw = self.static_layer is None or self._static_key != self._key(robots, selected)
+        if full_redraw:
+            self._build_static_layer(robots, selected)
+        else:
+            # Effacer les zones dynamiques de l'image précédente et la zone du titre
+            for rect in self._previous_rects + self.viz.title_rects:
+                self.screen.blit(self.static_layer, rect, rect)
+
+        # Couches dynamiques
+        with self.profiler.section('draw'):
+            dynamic_rects = [robot.draw(self.screen, alpha) for robot in robots]
+        with self.profiler.section('graphs'):
+            colors = [robot.color for robot in robots]
+            labels = [robot.name or f"Robot {i+1}" for i, robot in enumerate(robots)]
+            dynamic_rects.append(self.viz.draw_pid_graph(
+                self.screen, [robot.pid.error_history for robot in robots], colors,
+                TRACK_WIDTH, 0, GRAPH_WIDTH, self.viz.height/2, labels))
+            dynamic_rects.append(self.viz.draw_pid_graph(
+                self.screen, [robot.pid.output_history for robot in robots], colors,
+                TRACK_WIDTH, self.viz.height/2, GRAPH_WIDTH, self.viz.height/2, labels))
+        if self.profiler.enabled:
+            dynamic_rects.append(self.viz.draw_profile(self.screen, self.profiler))
+        screen_rect = self.screen.get_rect()
+        dynamic_rects = [rect.clip(screen_rect) for rect in dynamic_rects]
+        dirty_rects = self._previous_rects + dynamic_rects + self.viz.title_rects
+
+        # Surcouche (titre) par-dessus les couches dynamiques
+        self.viz.draw_title(self.screen)
+
+        self._previous_rects = dynamic_rects
+        if full_redraw:
+            pygame.display.flip()
+            return [screen_rect]
+        pygame.display.update(dirty_rects)
+        return dirty_rects
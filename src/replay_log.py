@@ -0,0 +1,181 @@
+"""
+Journal binaire des simulations et relecture sans re-simulation.
+
+Format du fichier (little-endian) :
+    - en-tête de 16 octets : signature b'MZTR', version (uint16), réservé (uint16),
+      nombre de robots (uint32), nombre maximal de capteurs par robot (uint32) ;
+    - puis un enregistrement de taille fixe par tick, en colonnes : pour chaque
+      grandeur, les valeurs des N robots côte à côte (voir ``record_dtype``).
+      Les lectures d'un robot ayant moins de capteurs sont complétées par des zéros,
+      ``sensor_count`` donne le nombre de capteurs de chaque robot.
+
+La taille fixe des enregistrements permet d'accéder directement à n'importe quel
+tick (décalage = en-tête + tick * taille) et de lire le fichier en mémoire mappée.
+"""
+import struct
+import numpy as np
+
+MAGIC = b'MZTR'
+VERSION = 2
+HEADER = struct.Struct('<4sHHII')
+
+
+def record_dtype(n_robots: int, n_sensors: int) -> np.dtype:
+    """Type NumPy d'un enregistrement (un tick, tous les robots)."""
+    return np.dtype([
+        ('tick', '<u4'),
+        ('x', '<f4', (n_robots,)),
+        ('y', '<f4', (n_robots,)),
+        ('angle', '<f4', (n_robots,)),
+        ('current_error', '<f4', (n_robots,)),
+        ('pid_output', '<f4', (n_robots,)),
+        ('kp', '<f4', (n_robots,)),
+        ('ki', '<f4', (n_robots,)),
+        ('kd', '<f4', (n_robots,)),
+        ('sensor_count', '<u2', (n_robots,)),
+        ('sensor_values', '<u2', (n_robots, n_sensors)),
+    ])
+
+
+class TraceWriter:
+    """
+    Écrit l'état de tous les robots à chaque tick, en ajout seul.
+
+    Les valeurs sont accumulées dans des blocs préalloués de ``chunk_ticks`` ticks,
+    convertis en colonnes et écrits d'un coup quand ils sont pleins (coût par tick
+    très faible). ``n_sensors`` est le nombre maximal de capteurs d'un robot.
+    """
+
+    # Grandeurs scalaires par robot, dans l'ordre du bloc d'accumulation
+    FIELDS = ('x', 'y', 'angle', 'current_error', 'pid_output', 'kp', 'ki', 'kd')
+
+    def __init__(self, path: str, n_robots: int, n_sensors: int = 5, chunk_ticks: int = 256):
+        self.path = path
+        self.dtype = record_dtype(n_robots, n_sensors)
+        self._chunk = np.zeros(chunk_ticks, dtype=self.dtype)
+        self._values = np.zeros((chunk_ticks, n_robots, len(self.FIELDS)), dtype=np.float32)
+        self._sensors = np.zeros((chunk_ticks, n_robots, n_sensors), dtype=np.uint16)
+        self._sensor_counts = np.zeros((chunk_ticks, n_robots), dtype=np.uint16)
+        self._count = 0
+        self.ticks = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, n_robots, n_sensors))
+
+    def record(self, robots: list):
+        """Ajoute un tick pour la liste de robots."""
+        self._values[self._count] = [(r.x, r.y, r.angle, r.current_error, r.pid_output,
+                                      r.pid.kp, r.pid.ki, r.pid.kd) for r in robots]
+        sensors = [r.sensor_values for r in robots]
+        counts = [len(values) for values in sensors]
+        self._sensor_counts[self._count] = counts
+        if min(counts, default=0) == self._sensors.shape[2]:
+            self._sensors[self._count] = sensors
+        else:
+            # Capteurs différents selon les robots : lectures complétées par des zéros
+            for i, (values, count) in enumerate(zip(sensors, counts)):
+                self._sensors[self._count, i, :count] = values
+                self._sensors[self._count, i, count:] = 0
+        self._count += 1
+        self.ticks += 1
+        if self._count == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        """Écrit les ticks en attente."""
+        if self._count:
+            chunk = self._chunk[:self._count]
+            chunk['tick'] = np.arange(self.ticks - self._count, self.ticks)
+            for i, field in enumerate(self.FIELDS):
+                chunk[field] = self._values[:self._count, :, i]
+            chunk['sensor_count'] = self._sensor_counts[:self._count]
+            chunk['sensor_values'] = self._sensors[:self._count]
+            self._file.write(chunk.tobytes())
+            self._file.flush()
+            self._count = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    """Lecture en mémoire mappée d'un journal, avec accès direct à n'importe quel tick."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            magic, version, _, n_robots, n_sensors = HEADER.unpack(f.read(HEADER.size))
+            size = f.seek(0, 2) - HEADER.size
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} n'est pas un journal de simulation valide")
+        self.n_robots = n_robots
+        self.n_sensors = n_sensors
+        self.dtype = record_dtype(n_robots, n_sensors)
+        # Un tick incomplet en fin de fichier (écriture interrompue) est ignoré
+        count = size // self.dtype.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=self.dtype, mode='r', offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, tick):
+        return self.records[tick]
+
+    def apply(self, robots: list, tick: int):
+        """Place les robots dans l'état enregistré au tick donné et prolonge leurs historiques."""
+        row = self.records[tick]
+        for i, robot in enumerate(robots[:self.n_robots]):
+            robot.x = float(row['x'][i])
+            robot.y = float(row['y'][i])
+            robot.angle = float(row['angle'][i])
+            robot.previous_pose = (robot.x, robot.y, robot.angle)
+            robot.current_error = float(row['current_error'][i])
+            robot.pid_output = float(row['pid_output'][i])
+            robot.sensor_values = row['sensor_values'][i, :row['sensor_count'][i]].tolist()
+            robot.pid.kp, robot.pid.ki, robot.pid.kd = (float(row[k][i]) for k in ('kp', 'ki', 'kd'))
+            robot.pid.last_error = robot.current_error / 60
+            robot.path_history.append((robot.x, robot.y))
+            robot.pid.error_history.append(robot.pid.last_error)
+            robot.pid.output_history.append(robot.pid_output)
+
+    def seek(self, robots: list, tick: int):
+        """Accès direct : reconstruit l'état et les historiques des robots jusqu'au tick donné."""
+        for robot in robots:
+            robot.path_history.clear()
+            robot.pid.error_history.clear()
+            robot.pid.output_history.clear()
+        window = max((max(r.path_history.capacity, r.pid.error_history.capacity) for r in robots), default=0)
+        for t in range(max(0, tick - window + 1), tick + 1):
+            self.apply(robots, t)
+
+
+class ReplayPlayer:
+    """Lecture d'un journal dans la boucle d'affichage (pause et déplacement dans le temps)."""
+
+    def __init__(self, reader: TraceReader, robots: list):
+        self.reader = reader
+        self.robots = robots
+        self.tick = -1
+        self.paused = False
+
+    def step(self):
+        """Avance d'un tick (sauf en pause ou en fin de journal)."""
+        if self.paused or self.tick + 1 >= len(self.reader):
+            return
+        self.tick += 1
+        self.reader.apply(self.robots, self.tick)
+
+    def seek(self, delta: int):
+        """Se déplace de ``delta`` ticks."""
+        if len(self.reader) == 0:
+            return
+        self.tick = min(max(self.tick + delta, 0), len(self.reader) - 1)
+        self.reader.seek(self.robots, self.tick)
@@ -0,0 +1,77 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Tampon circulaire de capacité fixe, préalloué dans un tableau NumPy.
+
+    Chaque valeur est écrite deux fois (à i et i + capacité) : le contenu, du plus
+    ancien au plus récent, est ainsi toujours une tranche contiguë du tableau, que
+    ``view()`` retourne sans copie (pratique pour le tracé). Une capacité nulle
+    désactive l'historique : ``append`` ne fait alors rien.
+    """
+
+    def __init__(self, capacity: int, item_shape: tuple = (), dtype=float):
+        self.capacity = max(0, int(capacity))
+        self._data = np.zeros((2 * self.capacity,) + tuple(item_shape), dtype=dtype)
+        self._start = 0
+        self._length = 0
+        # Nombre total de valeurs ajoutées depuis la création (ou le dernier clear)
+        self.total = 0
+        # Incrémenté par clear et restore : le contenu ne prolonge plus celui déjà lu
+        self.generation = 0
+
+    def append(self, value):
+        """Ajoute une valeur, en écrasant la plus ancienne si le tampon est plein."""
+        if self.capacity == 0:
+            return
+        if self._length < self.capacity:
+            index = self._start + self._length
+            self._length += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        index %= self.capacity
+        self._data[index] = value
+        self._data[index + self.capacity] = value
+        self.total += 1
+
+    def view(self) -> np.ndarray:
+        """Vue (sans copie, en lecture seule) du contenu, du plus ancien au plus récent."""
+        view = self._data[self._start:self._start + self._length]
+        view.flags.writeable = False
+        return view
+
+    def clear(self):
+        """Vide le tampon sans réallouer."""
+        self._start = 0
+        self._length = 0
+        self.total = 0
+        self.generation += 1
+
+    def state(self) -> tuple:
+        """Copie du contenu (du plus ancien au plus récent) et compteur total, pour ``restore``."""
+        return self.view().copy(), self.total
+
+    def restore(self, values, total: int = None):
+        """Remplace le contenu par ``values`` (les plus récentes si elles dépassent la capacité)."""
+        self.clear()
+        values = np.asarray(values, dtype=self._data.dtype)
+        count = min(len(values), self.capacity)
+        if count:
+            self._data[:count] = values[len(values) - count:]
+            self._data[self.capacity:self.capacity + count] = values[len(values) - count:]
+        self._length = count
+        self.total = len(values) if total is None else int(total)
+
+    def tolist(self) -> list:
+        return self.view().tolist()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __getitem__(self, index):
+        return self.view()[index]
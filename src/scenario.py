@@ -0,0 +1,83 @@
+"""
+Scénarios : description JSON des robots (et optionnellement de la piste) d'une simulation.
+
+Exemple :
+    {
+      "track": {"path": "tracks/slalom.svg", "smoothing": "catmull-rom", "spacing": 5},
+      "robots": [
+        {"name": "prudent", "x": 50, "y": 330, "theta": 90, "color": "BLUE",
+         "kp": 0.1, "ki": 0.1, "kd": 0.1},
+        {"name": "rapide", "x": 50, "y": 315, "theta": 90, "color": [255, 150, 50],
+         "kp": 0.2, "kd": 0.1, "speed": 3.0,
+         "sensors": [[-8, 12], [0, 12], [8, 12]], "weights": [-1, 0, 1]}
+      ]
+    }
+
+Toutes les clés d'un robot sont optionnelles ; sans couleur, une teinte distincte
+est attribuée à chaque robot.
+"""
+import colorsys
+import json
+from configuration import colors
+from src.robot import Robot
+from src.track import Track
+
+# Valeurs par défaut d'un robot de scénario
+ROBOT_DEFAULTS = {'x': 50.0, 'y': 180.0, 'theta': 0.0, 'kp': 0.1, 'ki': 0.0, 'kd': 0.0, 'speed': 2.0}
+
+
+def palette_color(index: int, count: int) -> tuple:
+    """Couleur distincte du robot ``index`` parmi ``count`` (teintes réparties uniformément)."""
+    r, g, b = colorsys.hsv_to_rgb(index / max(count, 1), 0.65, 1.0)
+    return int(r * 255), int(g * 255), int(b * 255)
+
+
+def parse_color(value, index: int, count: int) -> tuple:
+    """Couleur donnée par son nom (configuration.colors) ou en [r, g, b]."""
+    if value is None:
+        return palette_color(index, count)
+    if isinstance(value, str):
+        try:
+            return getattr(colors, value.upper())
+        except AttributeError:
+            raise ValueError(f"Couleur inconnue : {value}") from None
+    return tuple(int(c) for c in value)
+
+
+def robot_from_config(config: dict, index: int = 0, count: int = 1, record_history: bool = True) -> Robot:
+    """Construit un Robot à partir de sa description de scénario."""
+    values = {**ROBOT_DEFAULTS, **config}
+    return Robot(
+        values['x'], values['y'],
+        color=parse_color(config.get('color'), index, count),
+        kp=values['kp'], ki=values['ki'], kd=values['kd'],
+        name=config.get('name', f"Robot {index + 1}"),
+        theta=values['theta'],
+        record_history=record_history,
+        speed=values['speed'],
+        sensor_positions_local=config.get('sensors'),
+        sensor_weights=config.get('weights'),
+    )
+
+
+def load_scenario(path: str, record_history: bool = True) -> dict:
+    """
+    Lit un fichier de scénario.
+
+    Returns:
+        dict: 'robots' (liste de Robot) et 'track' (Track chargée depuis le fichier
+        indiqué, ou None si le scénario n'en déclare pas)
+    """
+    with open(path) as f:
+        scenario = json.load(f)
+    configs = scenario.get('robots', [])
+    if not configs:
+        raise ValueError(f"{path} : le scénario ne déclare aucun robot")
+    robots = [robot_from_config(config, i, len(configs), record_history) for i, config in enumerate(configs)]
+
+    track = None
+    track_config = scenario.get('track')
+    if track_config:
+        track = Track.from_file(track_config['path'], smoothing=track_config.get('smoothing'),
+                                spacing=track_config.get('spacing'), cache_dir=track_config.get('cache_dir', '.cache'))
+    return {'robots': robots, 'track': track}
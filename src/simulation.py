@@ -0,0 +1,77 @@
+import numpy as np
+from configuration.robot import ROBOT_WIDTH
+from src.robot import Robot
+from src.track import Track
+
+
+class Simulation:
+    """Simulation sans affichage (headless) de plusieurs robots sur une piste.
+
+    Fait avancer les robots avec ``Robot.update`` aussi vite que le CPU le permet,
+    sans fenêtre, sans horloge et sans importer pygame. ``dt`` est le pas de temps
+    en ticks de référence (ex. ``REFERENCE_HZ / 1000`` pour une physique à 1 kHz).
+    ``log`` (un ``TraceWriter``) enregistre l'état de tous les robots à chaque tick.
+    """
+
+    def __init__(self, track: Track = None, robots: list = None, dt: float = 1.0, log=None):
+        self.track = track if track is not None else Track()
+        self.robots = list(robots) if robots is not None else [Robot(record_history=False)]
+        self.dt = dt
+        self.log = log
+        self.tick = 0
+
+    def step(self):
+        """Avance tous les robots d'un tick."""
+        # Distances capteurs-piste de tous les robots calculées en un seul appel
+        positions = [robot.get_sensor_positions() for robot in self.robots]
+        if positions and len({len(p) for p in positions}) == 1:
+            all_distances = self.track.sensor_distances(positions, int(ROBOT_WIDTH*0.2)).tolist()
+        else:
+            all_distances = [None] * len(self.robots)
+        for robot, distances in zip(self.robots, all_distances):
+            robot.update(self.track, distances=distances, dt=self.dt)
+        if self.log is not None:
+            self.log.record(self.robots)
+        self.tick += 1
+
+    def run(self, ticks: int, stop=None) -> dict:
+        """
+        Simule ``ticks`` pas et retourne les traces de chaque robot.
+
+        Args:
+            ticks (int): Nombre de pas de simulation
+            stop (callable): Condition d'arrêt anticipé ``stop(simulation) -> bool``
+                évaluée après chaque pas ; les traces sont alors tronquées
+
+        Returns:
+            dict: Tableaux NumPy de forme (ticks, n_robots) pour 'x', 'y', 'angle',
+            'error' et 'output', et (ticks, n_robots, n_capteurs) pour 'sensor_values'
+        """
+        n = len(self.robots)
+        sensor_count = max((len(r.sensor_positions_local) for r in self.robots), default=0)
+        trace = {
+            'x': np.empty((ticks, n)),
+            'y': np.empty((ticks, n)),
+            'angle': np.empty((ticks, n)),
+            'error': np.empty((ticks, n)),
+            'output': np.empty((ticks, n)),
+            'sensor_values': np.zeros((ticks, n, sensor_count)),
+        }
+        for t in range(ticks):
+            self.step()
+            for j, robot in enumerate(self.robots):
+                trace['x'][t, j] = robot.x
+                trace['y'][t, j] = robot.y
+                trace['angle'][t, j] = robot.angle
+                trace['error'][t, j] = robot.current_error
+                trace['output'][t, j] = robot.pid_output
+                trace['sensor_values'][t, j, :len(robot.sensor_values)] = robot.sensor_values
+            if stop is not None and stop(self):
+                return {key: values[:t + 1] for key, values in trace.items()}
+        return trace
+
+    def reset(self):
+        """Remet les robots à leur position de départ."""
+        for robot in self.robots:
+            robot.reset()
+        self.tick = 0
@@ -0,0 +1,39 @@
+import functools
+import pygame
+from configuration.colors import *
+
+# Pas de quantification de l'angle des sprites (en degrés) : 360 rotations possibles
+ANGLE_STEP = 1
+
+
+def quantize_angle(angle: float) -> int:
+    """Ramène un angle (en degrés) à l'un des 360 angles mis en cache."""
+    return int(round(angle / ANGLE_STEP) * ANGLE_STEP) % 360
+
+
+@functools.lru_cache(maxsize=None)
+def body_sprite(color: tuple, width: int, height: int) -> pygame.Surface:
+    """Surface du corps du robot (rectangle arrondi), non tournée."""
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.rect(surface, color, (0, 0, width, height), 2, border_radius=5)
+    return surface
+
+
+@functools.lru_cache(maxsize=None)
+def wheel_sprite(width: int, height: int) -> pygame.Surface:
+    """Surface d'une roue arrière, non tournée."""
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.rect(surface, GRAY, (0, 0, width, height), border_radius=3)
+    return surface
+
+
+@functools.lru_cache(maxsize=360 * 32)
+def rotated_body(color: tuple, width: int, height: int, angle: int) -> pygame.Surface:
+    """Corps du robot tourné de ``angle`` degrés (cache LRU par couleur, taille et angle)."""
+    return pygame.transform.rotate(body_sprite(color, width, height), angle)
+
+
+@functools.lru_cache(maxsize=360 * 4)
+def rotated_wheel(width: int, height: int, angle: int) -> pygame.Surface:
+    """Roue arrière tournée de ``angle`` degrés (partagée par les deux roues)."""
+    return pygame.transform.rotate(wheel_sprite(width, height), angle)
@@ -0,0 +1,184 @@
+import numpy as np
+from configuration.robot import ROBOT_HEIGHT, ROBOT_WIDTH
+from src.kernels import FUSED_MAX_SEGMENTS, NUMBA_AVAILABLE, fused_step
+from src.track import Track
+
+
+class RobotSwarm:
+    """
+    Essaim de N robots stocké en structure de tableaux (un tableau NumPy par grandeur).
+
+    Reproduit la cinématique de ``Robot.update_position`` et le calcul de ``PID.compute``
+    pour tous les robots en un seul ``step()`` vectorisé, sans objet Python par robot.
+
+    ``fused`` choisit le noyau fusionné de ``src.kernels`` (un seul appel compilé par
+    tick) : par défaut seulement si Numba est disponible ; ``True`` le force (en Python
+    pur sans Numba), ``False`` garde le chemin NumPy.
+    """
+
+    def __init__(self, n: int, start_x=50.0, start_y=180.0, theta=0.0, kp=0.1, ki=0.0, kd=0.0,
+                 speed=2.0, sensor_positions_local=None, sensor_weights=None, fused: bool = None):
+        self.n = n
+        self.fused = NUMBA_AVAILABLE if fused is None else fused
+        # Pose de départ et pose courante
+        self.start_x = self._column(start_x)
+        self.start_y = self._column(start_y)
+        self.start_angle = self._column(theta)
+        self.x = self.start_x.copy()
+        self.y = self.start_y.copy()
+        self.angle = self.start_angle.copy()
+        self.speed = self._column(speed)  # pixels par frame
+
+        # Capteurs IR (mêmes positions locales et poids que Robot par défaut)
+        if sensor_positions_local is None:
+            sensor_positions_local = [
+                (-ROBOT_WIDTH*0.4, ROBOT_HEIGHT*0.4),
+                (-ROBOT_WIDTH*0.2, ROBOT_HEIGHT*0.4),
+                (0,                ROBOT_HEIGHT*0.4),
+                (ROBOT_WIDTH*0.2,  ROBOT_HEIGHT*0.4),
+                (ROBOT_WIDTH*0.4,  ROBOT_HEIGHT*0.4),
+            ]
+        self.sensor_positions_local = np.asarray(sensor_positions_local, dtype=float)
+        self.sensor_weights = np.asarray(sensor_weights if sensor_weights is not None else [-2, -1, 0, 1, 2], dtype=float)
+        self.max_sensor_distance = int(ROBOT_WIDTH*0.2)
+
+        # Contrôleur PID (gains et état par robot)
+        self.kp = self._column(kp)
+        self.ki = self._column(ki)
+        self.kd = self._column(kd)
+        self.error_scale = 60
+        self.integral_limit = 100.0
+        self.integral = np.zeros(n)
+        self.previous_error = np.zeros(n)
+
+        # Dernières lectures
+        self.sensor_values = np.zeros((n, len(self.sensor_positions_local)))
+        self.current_error = np.zeros(n)
+        self.pid_output = np.zeros(n)
+
+    def _column(self, value) -> np.ndarray:
+        """Diffuse un scalaire ou une séquence en tableau contigu de taille n (copie modifiable)."""
+        return np.array(np.broadcast_to(np.asarray(value, dtype=float), (self.n,)))
+
+    @classmethod
+    def from_robots(cls, robots: list) -> "RobotSwarm":
+        """
+        Construit un essaim à partir d'objets Robot (pose, vitesse, gains et état PID).
+
+        Tous les robots partagent les capteurs de l'essaim : ValueError si leurs
+        positions ou poids de capteurs diffèrent.
+        """
+        layouts = {(np.asarray(r.sensor_positions_local, dtype=float).tobytes(),
+                    np.asarray(r.sensor_weights, dtype=float).tobytes()) for r in robots}
+        if len(layouts) > 1:
+            raise ValueError("RobotSwarm : tous les robots doivent avoir les mêmes capteurs (positions et poids)")
+        swarm = cls(
+            len(robots),
+            start_x=[r.start_pos[0] for r in robots],
+            start_y=[r.start_pos[1] for r in robots],
+            theta=[r.start_angle for r in robots],
+            kp=[r.pid.kp for r in robots],
+            ki=[r.pid.ki for r in robots],
+            kd=[r.pid.kd for r in robots],
+            speed=[r.speed for r in robots],
+            sensor_positions_local=robots[0].sensor_positions_local,
+            sensor_weights=robots[0].sensor_weights,
+        )
+        swarm.x[:] = [r.x for r in robots]
+        swarm.y[:] = [r.y for r in robots]
+        swarm.angle[:] = [r.angle for r in robots]
+        swarm.integral[:] = [r.pid.integral for r in robots]
+        swarm.previous_error[:] = [r.pid.previous_error for r in robots]
+        return swarm
+
+    def get_sensor_positions(self) -> np.ndarray:
+        """Positions globales des capteurs, tableau (n, n_capteurs, 2)."""
+        theta = np.radians(-self.angle)[:, None]
+        cos, sin = np.cos(theta), np.sin(theta)
+        sx, sy = self.sensor_positions_local[:, 0], self.sensor_positions_local[:, 1]
+        positions = np.empty((self.n, len(sx), 2))
+        positions[..., 0] = self.x[:, None] + (sx * cos - sy * sin)
+        positions[..., 1] = self.y[:, None] + (sx * sin + sy * cos)
+        return positions
+
+    def get_sensor_values(self, track: Track) -> np.ndarray:
+        """Valeurs des capteurs entre 99 et 1024 (même normalisation que Robot.get_sensor_values)."""
+        max_distance = self.max_sensor_distance
+        distances = track.sensor_distances(self.get_sensor_positions(), max_distance)
+        values = np.trunc((max_distance - distances) / max_distance * 1024)
+        self.sensor_values = np.clip(values, 99, 1024)
+        return self.sensor_values
+
+    def step(self, track: Track, dt: float = 1.0, sensor_values=None):
+        """Avance tous les robots d'un tick de ``dt`` ticks de référence (capteurs, PID puis position).
+
+        ``sensor_values`` (n, n_capteurs) remplace la lecture des capteurs IR, ex.
+        ``CameraSensors.read(swarm.get_sensor_positions())``."""
+        if sensor_values is None and self._use_fused(track):
+            self._fused_step(track, dt)
+            return
+        if sensor_values is None:
+            sensor_values = self.get_sensor_values(track)
+        else:
+            self.sensor_values = sensor_values = np.asarray(sensor_values, dtype=float)
+
+        # Erreur pondérée
+        self.current_error = sensor_values @ self.sensor_weights / np.abs(self.sensor_weights).sum()
+
+        # Correction PID (même calcul que PID.compute(error, 60))
+        error = self.current_error / self.error_scale
+        self.integral = np.clip(self.integral + error * dt, -self.integral_limit, self.integral_limit)
+        derivative = (error - self.previous_error) / dt
+        self.pid_output = self.kp * self.current_error + self.ki * self.integral + self.kd * derivative
+        self.previous_error = error
+
+        # Application de la correction à l'angle puis mise à jour de la position
+        self.angle += self.pid_output * dt
+        heading = np.radians(self.angle)
+        self.x += self.speed * dt * np.sin(heading)
+        self.y += self.speed * dt * np.cos(heading)
+
+    def _use_fused(self, track: Track) -> bool:
+        """Noyau fusionné : piste géométrique (pas de carte de distance) et pas trop de segments."""
+        return (self.fused and track.distance_field is None
+                and len(track.get_segment_arrays()[0]) <= FUSED_MAX_SEGMENTS)
+
+    def _fused_step(self, track: Track, dt: float):
+        """Tick complet de tous les robots en un appel au noyau fusionné."""
+        starts, ends = track.get_segment_arrays()[:2]
+        # Tampon propre au noyau (sensor_values peut référencer un tableau fourni par l'appelant)
+        shape = (self.n, len(self.sensor_positions_local))
+        if getattr(self, '_fused_sensor_values', None) is None or self._fused_sensor_values.shape != shape:
+            self._fused_sensor_values = np.zeros(shape)
+        self.sensor_values = self._fused_sensor_values
+        fused_step(self.x, self.y, self.angle, self.speed, self.kp, self.ki, self.kd,
+                   self.integral, self.previous_error, self.sensor_positions_local, self.sensor_weights,
+                   starts, ends, float(self.max_sensor_distance), float(self.error_scale),
+                   float(self.integral_limit), float(dt), self.sensor_values, self.current_error, self.pid_output)
+
+    def run(self, track: Track, ticks: int, dt: float = 1.0) -> dict:
+        """
+        Simule ``ticks`` pas et retourne les traces.
+
+        Returns:
+            dict: Tableaux de forme (ticks, n) pour 'x', 'y', 'angle', 'error' et 'output'
+        """
+        trace = {key: np.empty((ticks, self.n)) for key in ('x', 'y', 'angle', 'error', 'output')}
+        for t in range(ticks):
+            self.step(track, dt)
+            trace['x'][t] = self.x
+            trace['y'][t] = self.y
+            trace['angle'][t] = self.angle
+            trace['error'][t] = self.current_error
+            trace['output'][t] = self.pid_output
+        return trace
+
+    def reset(self):
+        """Remet tous les robots à leur pose de départ et réinitialise les PID."""
+        self.x[:] = self.start_x
+        self.y[:] = self.start_y
+        self.angle[:] = self.start_angle
+        self.integral[:] = 0.0
+        self.previous_error[:] = 0.0
+        self.current_error = np.zeros(self.n)
+        self.pid_output = np.zeros(self.n)
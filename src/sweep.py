@@ -0,0 +1,114 @@
+"""
+Balayage (grid search) des gains PID sur la piste Moose Test, sans affichage.
+
+Exemple :
+    python -m src.sweep --kp 0:1:11 --ki 0 --kd 0:3:16 --ticks 800 -o sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from configuration.screen import SCREEN_HEIGHT
+from src.metrics import trajectory_metrics
+from src.parallel import default_chunk_size
+from src.swarm import RobotSwarm
+from src.track import Track
+
+# Pose de départ par défaut (x, y, angle en degrés), comme dans main.py
+DEFAULT_POSE = (50, SCREEN_HEIGHT // 2, 90)
+
+RESULT_FIELDS = ['kp', 'ki', 'kd', 'speed', 'x', 'y', 'theta',
+                 'rms_cte', 'max_cte', 'settling_tick', 'completed', 'completion_tick', 'progress']
+
+
+def _run_chunk(configs: list, ticks: int) -> list:
+    """Simule un lot de configurations (kp, ki, kd, speed, x, y, theta) dans un seul essaim."""
+    track = Track()
+    columns = np.array(configs, dtype=float).T
+    kp, ki, kd, speed, x, y, theta = columns
+    swarm = RobotSwarm(len(configs), start_x=x, start_y=y, theta=theta, kp=kp, ki=ki, kd=kd, speed=speed)
+    trace = swarm.run(track, ticks)
+    metrics = trajectory_metrics(trace['x'], trace['y'], track)
+
+    rows = []
+    for i, config in enumerate(configs):
+        row = dict(zip(RESULT_FIELDS[:7], config))
+        row.update({key: values[i].item() for key, values in metrics.items()})
+        rows.append(row)
+    return rows
+
+
+def sweep(kp_values, ki_values, kd_values, speeds=(2.0,), poses=(DEFAULT_POSE,),
+          ticks: int = 1000, workers: int = None, chunk_size: int = None) -> list:
+    """
+    Évalue toutes les combinaisons de gains, vitesses et poses de départ en parallèle.
+
+    Les configurations sont regroupées en lots simulés chacun par un ``RobotSwarm``
+    et répartis sur les cœurs avec un ``ProcessPoolExecutor`` ; sans ``chunk_size``,
+    la taille des lots dépend du nombre de configurations et de ``workers``
+    (voir ``src.parallel.default_chunk_size``).
+
+    Returns:
+        list: Une ligne de résultats (dict, colonnes RESULT_FIELDS) par configuration
+    """
+    configs = [(kp, ki, kd, speed, *pose)
+               for kp, ki, kd, speed, pose in itertools.product(kp_values, ki_values, kd_values, speeds, poses)]
+    chunk_size = chunk_size or default_chunk_size(len(configs), workers)
+    chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        results = [_run_chunk(chunk, ticks) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chunk, chunks, itertools.repeat(ticks)))
+    return [row for rows in results for row in rows]
+
+
+def write_results(rows: list, path: str):
+    """Écrit le tableau de résultats au format CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def parse_range(text: str) -> list:
+    """Lit 'début:fin:nombre' (valeurs espacées linéairement) ou une liste 'a,b,c'."""
+    if ':' in text:
+        start, stop, count = text.split(':')
+        return np.linspace(float(start), float(stop), int(count)).tolist()
+    return [float(value) for value in text.split(',')]
+
+
+def parse_pose(text: str) -> tuple:
+    """Lit une pose de départ 'x,y,theta'."""
+    x, y, theta = (float(value) for value in text.split(','))
+    return x, y, theta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balayage des gains PID sur la piste Moose Test")
+    parser.add_argument('--kp', type=parse_range, default=parse_range('0:1:11'))
+    parser.add_argument('--ki', type=parse_range, default=parse_range('0'))
+    parser.add_argument('--kd', type=parse_range, default=parse_range('0:3:16'))
+    parser.add_argument('--speed', type=parse_range, default=parse_range('2'))
+    parser.add_argument('--pose', type=parse_pose, action='append', help="Pose de départ x,y,theta (répétable)")
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('-o', '--output', default='sweep_results.csv')
+    args = parser.parse_args()
+
+    rows = sweep(args.kp, args.ki, args.kd, args.speed, args.pose or [DEFAULT_POSE],
+                 ticks=args.ticks, workers=args.workers)
+    write_results(rows, args.output)
+
+    completed = sorted((r for r in rows if r['completed']), key=lambda r: r['rms_cte'])
+    print(f"{len(rows)} configurations évaluées, {len(completed)} terminent la piste -> {args.output}")
+    for r in completed[:5]:
+        print(f"  Kp={r['kp']:.3f} Ki={r['ki']:.5f} Kd={r['kd']:.3f} : RMS={r['rms_cte']:.2f}, "
+              f"max={r['max_cte']:.2f}, arrivée au tick {r['completion_tick']}")
+
+
+if __name__ == '__main__':
+    main()
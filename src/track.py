@@ -1,9 +1,17 @@
-import pygame
 import math
-import random
-from src.pid_controller import *
-from configuration.colors import *
-from configuration.screen import *
+import os
+import hashlib
+import numpy as np
+from configuration.screen import LINE_WIDTH, SCREEN_HEIGHT, TRACK_WIDTH
+from src.geometry import (SegmentGrid, arc_length, distances_to_polyline, distance_point_to_segment,
+                          nearest_segments, project_onto_segments, bake_distance_field, sample_distance_field)
+
+# En dessous de ce nombre de segments, le noyau vectorisé est plus rapide que l'index spatial
+SEGMENT_INDEX_MIN_SEGMENTS = 64
+# Projection avec indice de départ : segments parcourus au plus depuis l'indice (scalaire)
+PROJECTION_MAX_WALK = 64
+# et segments examinés de part et d'autre de l'indice (vectorisée)
+PROJECTION_WINDOW = 4
 
 class Track:
     """Générateur de piste Moose Test"""
@@ -11,11 +19,24 @@ class Track:
         self.width = width
         self.height = height
         self.line_width = LINE_WIDTH
+        self.closed = False
+        self._segment_index = None
+        self._arc_length = None
+        self._segments = None
+        # Carte de distance précalculée (optionnelle, voir bake_distance_field)
+        self.distance_field = None
+        self.distance_field_resolution = 1.0
+        # Incrémenté à chaque changement de points (invalide les caches de rendu)
+        self.version = 0
         self.set_track_points_init()
         
-    def set_track_points(self, points=[(0, SCREEN_HEIGHT // 2),(TRACK_WIDTH, SCREEN_HEIGHT // 2),]):
+    def set_track_points(self, points=[(0, SCREEN_HEIGHT // 2),(TRACK_WIDTH, SCREEN_HEIGHT // 2),], arc_length=None):
+        """arc_length : abscisse curviligne des points si elle est déjà calculée (pistes chargées)."""
         self.points = points
+        self._points_changed()
+        self._arc_length = None if arc_length is None else np.asarray(arc_length, dtype=float)
     def set_track_points_init(self):
+        self._points_changed()
         self.points = [
             # Phase 1: ligne droite
             (50, self.height // 2),
@@ -32,22 +53,230 @@ class Track:
             (800, self.height // 2),
             (800, self.height // 2-100)
         ]
+    @classmethod
+    def from_file(cls, path: str, smoothing: str = None, spacing: float = None,
+                  samples_per_segment: int = 8, cache_dir: str = None, **kwargs) -> "Track":
+        """
+        Crée une piste à partir d'un fichier JSON, CSV ou SVG (voir src.track_loader).
+
+        Args:
+            smoothing (str): None, 'catmull-rom' ou 'bspline'
+            spacing (float): Pas du rééchantillonnage en abscisse curviligne (pixels)
+            cache_dir (str): Répertoire du cache des pistes traitées
+        """
+        from src.track_loader import load_track_data
+        data = load_track_data(path, smoothing, spacing, samples_per_segment, cache_dir)
+        track = cls(**kwargs)
+        track.set_track_points(list(map(tuple, data['points'].tolist())), arc_length=data['arc_length'])
+        track.closed = data['closed']
+        return track
+    def _points_changed(self):
+        """Invalide tout ce qui est dérivé des points de la piste."""
+        self._segment_index = None
+        self._arc_length = None
+        self._segments = None
+        self.distance_field = None
+        self.version += 1
     def get_track_points(self):
         return self.points
-    def draw_track(self,screen):
-        """Génère la piste de Moose Test"""
-        # Ligne blanche avec trajectoire Moose Test
-        points = self.points
-        # Fond de piste
-        # pygame.draw.rect(surface, LINE_COLOR, (0, 0, TRACK_WIDTH, SCREEN_HEIGHT))
-        # Dessine la ligne épaisse
-        if len(points) > 1:
-            for i in range(len(points) - 1):
-                pygame.draw.line(screen, LINE_COLOR, points[i], points[i + 1], self.line_width)
-        return screen
-    
-    def draw_track(self, screen: pygame.Surface):
-        points = self.points
-        if len(points) > 1:
-            for i in range(len(points) - 1):
-                pygame.draw.line(screen, LINE_COLOR, points[i], points[i + 1], self.line_width)
\ No newline at end of file
+    def get_arc_length(self) -> np.ndarray:
+        """Abscisse curviligne cumulée de chaque point de la piste (mise en cache)."""
+        if self._arc_length is None:
+            self._arc_length = arc_length(self.points)[1]
+        return self._arc_length
+    def get_segment_lengths(self) -> np.ndarray:
+        """Longueur de chaque segment de la piste."""
+        return np.diff(self.get_arc_length())
+    def get_length(self) -> float:
+        """Longueur totale de la piste."""
+        arc = self.get_arc_length()
+        return float(arc[-1]) if len(arc) else 0.0
+    def get_segment_arrays(self) -> tuple:
+        """Débuts, fins, longueurs et caps (degrés) des segments, en tableaux NumPy (mis en cache)."""
+        if self._segments is None:
+            points = np.asarray(self.points, dtype=float).reshape(-1, 2)
+            starts, ends = points[:-1], points[1:]
+            delta = ends - starts
+            # Cap dans la convention de Robot.angle : déplacement (sin(cap), cos(cap))
+            heading = np.degrees(np.arctan2(delta[:, 0], delta[:, 1]))
+            self._segments = (starts, ends, self.get_segment_lengths(), heading)
+        return self._segments
+    def _nearest_segment_indices(self, points) -> np.ndarray:
+        """Indice du segment le plus proche de chaque point (n, 2), sans indice de départ."""
+        if len(self.points) - 1 < SEGMENT_INDEX_MIN_SEGMENTS:
+            return nearest_segments(points, self.points)[1]
+        index = self.get_segment_index()
+        return np.array([index.nearest(x, y)[1] for x, y in points], dtype=int).reshape(len(points))
+    def project(self, x: float, y: float, hint: int = None) -> tuple:
+        """
+        Projette le point (x, y) sur la piste.
+
+        Avec ``hint`` (le segment retourné par l'appel précédent), la recherche part de
+        ce segment et suit la piste tant que la distance diminue : le coût est O(1)
+        amorti pour un robot qui avance, et la projection reste sur la même portion
+        de piste quand celle-ci repasse à proximité. Sans ``hint`` (ou si la marche
+        dépasse PROJECTION_MAX_WALK segments), recherche globale dans l'index spatial.
+
+        Returns:
+            tuple: (abscisse curviligne s, écart latéral signé (positif à droite du
+            sens de parcours, à l'écran), cap de la piste en degrés (convention de
+            Robot.angle), indice du segment à passer en ``hint`` à l'appel suivant)
+        """
+        segments = self.get_segment_index().segments
+        if not segments:
+            return 0.0, 0.0, 0.0, -1
+        segment = -1
+        if hint is not None and 0 <= hint < len(segments):
+            segment = self._walk(x, y, hint, segments)
+        if segment < 0:
+            segment = self.get_segment_index().nearest(x, y)[1]
+
+        x1, y1, x2, y2 = segments[segment]
+        dx, dy = x2 - x1, y2 - y1
+        length_squared = dx * dx + dy * dy
+        t = 0.0 if length_squared == 0 else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length_squared))
+        distance = math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+        lateral = distance if dx * (y - y1) - dy * (x - x1) >= 0 else -distance
+        s = float(self.get_arc_length()[segment]) + t * math.sqrt(length_squared)
+        return s, lateral, math.degrees(math.atan2(dx, dy)), segment
+    def _walk(self, x: float, y: float, hint: int, segments: list) -> int:
+        """
+        Suit la piste depuis ``hint`` jusqu'au segment localement le plus proche (-1 si trop loin).
+
+        La marche part dans les deux sens et continue PROJECTION_WINDOW segments
+        au-delà du meilleur : les égalités (point le plus proche sur un sommet commun
+        à deux segments) et les petits creux de distance ne l'arrêtent pas avant le
+        vrai minimum.
+        """
+        start = distance_point_to_segment(x, y, *segments[hint])
+        best, segment = start, hint
+        for direction in (1, -1):
+            best_here, segment_here = start, hint
+            i = hint + direction
+            while 0 <= i < len(segments) and abs(i - segment_here) <= PROJECTION_WINDOW:
+                distance = distance_point_to_segment(x, y, *segments[i])
+                if distance < best_here:
+                    best_here, segment_here = distance, i
+                    if abs(segment_here - hint) > PROJECTION_MAX_WALK:
+                        return -1
+                i += direction
+            if best_here < best:
+                best, segment = best_here, segment_here
+        return segment
+    def project_many(self, points, hints=None) -> tuple:
+        """
+        Projection vectorisée de n points (n, 2) sur la piste (voir ``project``).
+
+        Avec ``hints`` (n indices de segment, -1 si inconnu), une fenêtre de
+        PROJECTION_WINDOW segments de part et d'autre est examinée puis recentrée sur
+        son minimum tant qu'elle en trouve un meilleur : même résultat que la marche
+        de ``project``. Les points qui s'éloignent de plus de PROJECTION_MAX_WALK
+        segments de leur indice (ou sans indice) sont recherchés globalement.
+
+        Returns:
+            tuple: Tableaux (n,) : s, écart latéral signé, cap (degrés), indice du segment
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        starts, ends, lengths, heading = self.get_segment_arrays()
+        n_segments = len(starts)
+        if n_segments == 0:
+            zeros = np.zeros(len(points))
+            return zeros, zeros.copy(), zeros.copy(), np.full(len(points), -1)
+
+        if hints is None:
+            segment = self._nearest_segment_indices(points)
+        else:
+            hints = np.asarray(hints, dtype=int).reshape(len(points))
+            offsets = np.arange(-PROJECTION_WINDOW, PROJECTION_WINDOW + 1)
+            segment = hints.copy()
+            lost = (hints < 0) | (hints >= n_segments)
+            active = np.flatnonzero(~lost)
+            # Fenêtre recentrée sur son minimum (strictement meilleur que le centre) jusqu'à stabilité
+            while len(active):
+                window = segment[active, None] + offsets
+                inside = (window >= 0) & (window < n_segments)
+                window = np.clip(window, 0, n_segments - 1)
+                distances, _ = project_onto_segments(points[active, None, :], starts[window], ends[window])
+                distances = np.where(inside, distances, np.inf)
+                k = distances.argmin(axis=1)
+                rows = np.arange(len(active))
+                moved = distances[rows, k] < distances[:, PROJECTION_WINDOW]
+                segment[active[moved]] = window[rows[moved], k[moved]]
+                far = moved & (np.abs(segment[active] - hints[active]) > PROJECTION_MAX_WALK)
+                lost[active[far]] = True
+                active = active[moved & ~far]
+            if lost.any():
+                segment[lost] = self._nearest_segment_indices(points[lost])
+
+        seg_starts, seg_ends = starts[segment], ends[segment]
+        distances, t = project_onto_segments(points, seg_starts, seg_ends)
+        delta = seg_ends - seg_starts
+        cross = delta[:, 0] * (points[:, 1] - seg_starts[:, 1]) - delta[:, 1] * (points[:, 0] - seg_starts[:, 0])
+        lateral = np.where(cross >= 0, distances, -distances)
+        s = self.get_arc_length()[segment] + t * lengths[segment]
+        return s, lateral, heading[segment], segment
+    def get_segment_index(self) -> SegmentGrid:
+        """Index spatial des segments, construit à la demande et mis en cache."""
+        if self._segment_index is None:
+            self._segment_index = SegmentGrid(self.points)
+        return self._segment_index
+    def nearest_distance(self, x: float, y: float, max_distance: float = None) -> float:
+        """Distance minimale entre le point (x, y) et la piste (plafonnée à max_distance si donné)."""
+        return self.get_segment_index().nearest(x, y, max_distance)[0]
+    def nearest_distances(self, points, max_distance: float = None):
+        """Distances minimales entre un lot de points (..., 2) et la piste (plafonnées à max_distance si donné)."""
+        if len(self.points) - 1 < SEGMENT_INDEX_MIN_SEGMENTS:
+            distances = distances_to_polyline(points, self.points)
+            return distances if max_distance is None else np.minimum(distances, max_distance)
+        points = np.asarray(points, dtype=float)
+        index = self.get_segment_index()
+        flat = [index.nearest(x, y, max_distance)[0] for x, y in points.reshape(-1, 2)]
+        return np.array(flat).reshape(points.shape[:-1])
+    def sensor_distances(self, points, max_distance: float = None):
+        """Distances capteurs-piste : carte de distance si elle est précalculée, géométrie sinon.
+
+        Au-delà de ``max_distance`` (portée des capteurs) la distance exacte n'est pas nécessaire."""
+        if self.distance_field is None:
+            return self.nearest_distances(points, max_distance)
+        distances = sample_distance_field(self.distance_field, self.distance_field_resolution, points)
+        outside = np.isnan(distances)
+        if outside.any():
+            distances[outside] = self.nearest_distances(np.asarray(points, dtype=float)[outside], max_distance)
+        return distances
+    def distance_field_key(self, resolution: float = 1.0, max_distance: float = None) -> str:
+        """Clé de cache de la carte de distance (points de la piste, LINE_WIDTH et paramètres)."""
+        digest = hashlib.sha1(np.asarray(self.points, dtype=np.float64).tobytes())
+        digest.update(repr((self.line_width, self.width, self.height, resolution, max_distance)).encode())
+        return digest.hexdigest()
+    def bake_distance_field(self, resolution: float = 1.0, max_distance: float = None, cache_dir: str = None):
+        """
+        Précalcule la carte de distance de la piste sur la zone width x height.
+
+        Les lectures de capteurs deviennent alors des interpolations bilinéaires en O(1).
+        Avec ``cache_dir``, la carte est enregistrée en .npy et rechargée en mémoire
+        mappée lors des exécutions suivantes.
+
+        Returns:
+            np.ndarray: Carte de distance float32 de forme (rows, cols)
+        """
+        path = None
+        if cache_dir is not None:
+            key = self.distance_field_key(resolution, max_distance)
+            path = os.path.join(cache_dir, f"distance_field_{key}.npy")
+            if os.path.exists(path):
+                self.distance_field = np.load(path, mmap_mode='r')
+                self.distance_field_resolution = resolution
+                return self.distance_field
+
+        field = bake_distance_field(self.points, self.width, self.height, resolution, max_distance)
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.save(path, field)
+        self.distance_field = field
+        self.distance_field_resolution = resolution
+        return field
+    def draw_track(self, screen):
+        """Dessine la ligne épaisse de la piste (voir src.drawing.draw_track)"""
+        # Import local : la simulation sans affichage ne doit pas charger pygame
+        from src.drawing import draw_track
+        draw_track(screen, self)
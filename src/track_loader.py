@@ -0,0 +1,255 @@
+"""
+Chargement de pistes depuis des fichiers (JSON, CSV, SVG), lissage, rééchantillonnage
+et cache disque des pistes traitées.
+
+Formats acceptés :
+    - JSON : ``{"points": [[x, y], ...], "closed": false}`` ou directement ``[[x, y], ...]`` ;
+    - CSV : une ligne ``x,y`` par point (en-tête et lignes ``#`` ignorés) ;
+    - SVG : premier ``<path>``, ``<polyline>`` ou ``<polygon>`` du document
+      (commandes M, L, H, V, C, S, Q, T et Z, absolues ou relatives ; courbes de
+      Bézier discrétisées, arcs non supportés).
+
+Le résultat d'un traitement (points, longueurs des segments, abscisse curviligne)
+est enregistré en .npz, sous une clé dérivée du contenu du fichier et des options :
+les chargements suivants ne relisent ni ne recalculent rien.
+"""
+import csv
+import glob
+import hashlib
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+import numpy as np
+from src.geometry import arc_length, remove_duplicate_points, resample_polyline, smooth_polyline
+
+# À incrémenter quand le traitement change (invalide les caches existants)
+CACHE_VERSION = 1
+TRACK_EXTENSIONS = ('.json', '.csv', '.svg')
+# Nombre de points par courbe de Bézier d'un chemin SVG
+BEZIER_SAMPLES = 16
+
+_SVG_TOKEN = re.compile(r'[A-DF-Za-df-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_SVG_ARITY = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2}
+
+
+def read_points(path: str) -> tuple[np.ndarray, bool]:
+    """
+    Lit les points d'une piste selon l'extension du fichier.
+
+    Returns:
+        tuple: (points (n, 2), piste fermée)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        return _read_json(path)
+    if extension == '.csv':
+        return _read_csv(path)
+    if extension == '.svg':
+        return _read_svg(path)
+    raise ValueError(f"Format de piste non supporté : {path}")
+
+
+def _read_json(path: str) -> tuple[np.ndarray, bool]:
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return np.asarray(data['points'], dtype=float).reshape(-1, 2), bool(data.get('closed', False))
+    return np.asarray(data, dtype=float).reshape(-1, 2), False
+
+
+def _read_csv(path: str) -> tuple[np.ndarray, bool]:
+    points = []
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0].lstrip().startswith('#'):
+                continue
+            try:
+                points.append((float(row[0]), float(row[1])))
+            except ValueError:
+                continue  # en-tête
+    return np.asarray(points, dtype=float).reshape(-1, 2), False
+
+
+def _bezier(control: np.ndarray) -> np.ndarray:
+    """Points d'une courbe de Bézier (quadratique ou cubique), sans le point de départ."""
+    t = np.linspace(0, 1, BEZIER_SAMPLES + 1)[1:, None]
+    if len(control) == 3:
+        p0, p1, p2 = control
+        return (1 - t) ** 2 * p0 + 2 * (1 - t) * t * p1 + t ** 2 * p2
+    p0, p1, p2, p3 = control
+    return (1 - t) ** 3 * p0 + 3 * (1 - t) ** 2 * t * p1 + 3 * (1 - t) * t ** 2 * p2 + t ** 3 * p3
+
+
+def parse_svg_path(d: str) -> tuple[np.ndarray, bool]:
+    """Convertit l'attribut ``d`` d'un chemin SVG en polyligne."""
+    tokens = _SVG_TOKEN.findall(d)
+    points = []
+    current = np.zeros(2)
+    start = np.zeros(2)
+    # Dernier point de contrôle et type de la courbe précédente (pour S et T)
+    last_control, last_curve = None, None
+    closed = False
+    command = None
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+            if command in 'Zz':
+                last_control, last_curve = None, None
+                closed = True
+                current = start.copy()
+                points.append(current)
+                continue
+        elif command is None:
+            raise ValueError(f"Chemin SVG invalide : {d[:40]}")
+        relative = command.islower()
+        origin = current if relative else np.zeros(2)
+        upper = command.upper()
+        arity = _SVG_ARITY.get(upper)
+        if arity is None:
+            raise ValueError(f"Commande SVG non supportée : {command}")
+        if i + arity > len(tokens) or any(token.isalpha() for token in tokens[i:i + arity]):
+            raise ValueError(f"Coordonnées manquantes après {command} : {d[:40]}")
+        values = np.asarray(tokens[i:i + arity], dtype=float)
+        i += arity
+        if upper in 'ST':
+            # Premier point de contrôle : reflet du dernier de la courbe précédente du même type
+            reflected = current
+            if last_control is not None and last_curve == ('C' if upper == 'S' else 'Q'):
+                reflected = 2 * current - last_control
+            values = np.concatenate((reflected - origin, values))
+            upper = 'C' if upper == 'S' else 'Q'
+        if upper in 'CQ':
+            control = np.vstack((current, origin + values.reshape(-1, 2)))
+            points.extend(_bezier(control))
+            last_control, last_curve = control[-2], upper
+            current = control[-1]
+            continue
+        last_control, last_curve = None, None
+        if upper == 'H':
+            current = np.array([values[0] + (current[0] if relative else 0), current[1]])
+        elif upper == 'V':
+            current = np.array([current[0], values[0] + (current[1] if relative else 0)])
+        else:
+            current = origin + values
+        if upper == 'M':
+            start = current.copy()
+            # Coordonnées suivant un M : lignes implicites
+            command = 'l' if relative else 'L'
+        points.append(current)
+    return np.asarray(points, dtype=float).reshape(-1, 2), closed
+
+
+def _read_svg(path: str) -> tuple[np.ndarray, bool]:
+    for element in ET.parse(path).iter():
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag == 'path' and element.get('d'):
+            return parse_svg_path(element.get('d'))
+        if tag in ('polyline', 'polygon') and element.get('points'):
+            values = np.asarray(_SVG_TOKEN.findall(element.get('points')), dtype=float)
+            return values.reshape(-1, 2), tag == 'polygon'
+    raise ValueError(f"Aucun chemin trouvé dans {path}")
+
+
+def process_points(points, smoothing: str = None, spacing: float = None, closed: bool = False,
+                   samples_per_segment: int = 8) -> dict:
+    """
+    Lisse puis rééchantillonne une polyligne.
+
+    Args:
+        smoothing (str): None, 'catmull-rom' ou 'bspline'
+        spacing (float): Pas du rééchantillonnage en pixels (None : pas de rééchantillonnage)
+        closed (bool): Piste fermée
+
+    Returns:
+        dict: 'points' (n, 2), 'segment_lengths' (n-1,), 'arc_length' (n,)
+    """
+    points = remove_duplicate_points(points)
+    if closed and len(points) > 2 and not np.array_equal(points[0], points[-1]):
+        points = np.vstack((points, points[:1]))
+    if smoothing is not None:
+        points = smooth_polyline(points, smoothing, samples_per_segment, closed)
+    if spacing is not None:
+        points = resample_polyline(points, spacing)
+    segment_lengths, cumulative = arc_length(points)
+    return {'points': points, 'segment_lengths': segment_lengths, 'arc_length': cumulative}
+
+
+def cache_key(path: str, **options) -> str:
+    """Clé de cache : contenu du fichier, options de traitement et version du traitement."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(repr((CACHE_VERSION, sorted(options.items()))).encode())
+    return digest.hexdigest()
+
+
+def load_track_data(path: str, smoothing: str = None, spacing: float = None,
+                    samples_per_segment: int = 8, cache_dir: str = None) -> dict:
+    """
+    Lit et traite un fichier de piste, en passant par le cache disque si ``cache_dir`` est donné.
+
+    Returns:
+        dict: Voir ``process_points``, plus 'closed'
+    """
+    options = {'smoothing': smoothing, 'spacing': spacing, 'samples_per_segment': samples_per_segment}
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f"track_{cache_key(path, **options)}.npz")
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                data = {name: cached[name] for name in cached.files}
+            data['closed'] = bool(data['closed'])
+            return data
+
+    points, closed = read_points(path)
+    data = process_points(points, smoothing, spacing, closed, samples_per_segment)
+    data['closed'] = closed
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Écriture atomique : un cache interrompu n'est jamais relu
+        temporary = cache_path + '.tmp.npz'
+        np.savez(temporary, **data)
+        os.replace(temporary, cache_path)
+    return data
+
+
+class TrackLibrary:
+    """
+    Bibliothèque de pistes d'un répertoire, chargées à la demande.
+
+    Seuls les noms de fichiers sont listés à la création ; chaque piste est lue
+    (ou reprise du cache disque) au premier accès puis gardée en mémoire.
+    """
+
+    def __init__(self, directory: str, cache_dir: str = None, **options):
+        self.directory = directory
+        self.cache_dir = cache_dir
+        self.options = options
+        self.paths = {}
+        for path in sorted(glob.glob(os.path.join(directory, '*'))):
+            name, extension = os.path.splitext(os.path.basename(path))
+            if extension.lower() in TRACK_EXTENSIONS:
+                self.paths.setdefault(name, path)
+        self._tracks = {}
+
+    def names(self) -> list:
+        return list(self.paths)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.paths
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, name: str):
+        """Piste ``name`` (objet Track), chargée au premier accès."""
+        track = self._tracks.get(name)
+        if track is None:
+            from src.track import Track
+            track = Track.from_file(self.paths[name], cache_dir=self.cache_dir, **self.options)
+            self._tracks[name] = track
+        return track
@@ -1,5 +1,4 @@
 import pygame
-import imageio
 import datetime
 
 def save_screenshot(screen, prefix="screenshot"):
@@ -9,63 +8,105 @@ def save_screenshot(screen, prefix="screenshot"):
     pygame.image.save(screen, filename)
     print(f"Capture sauvegardée : {filename}")
 
-def handle_events(robots, screen, running, recording, frames):
+class Selection:
+    """Indice du robot sélectionné (celui dont les gains sont réglés au clavier)."""
+
+    def __init__(self, count, index=0):
+        self.count = count
+        self.index = index
+
+    def next(self, step=1):
+        self.index = (self.index + step) % self.count
+
+class QuickSave:
+    """Point de reprise rapide en mémoire des robots et de la piste (F5 : capturer, F9 : y revenir)."""
+
+    def __init__(self, robots, track):
+        self.robots = robots
+        self.track = track
+        self.checkpoint = None
+
+    def save(self):
+        from src.checkpoint import Checkpoint
+        self.checkpoint = Checkpoint.capture(self.robots, self.track)
+        print("Point de reprise capturé")
+
+    def load(self):
+        if self.checkpoint is not None:
+            self.checkpoint.restore(self.robots, self.track)
+
+def handle_events(robots, screen, running, recorder, player=None, profiler=None, selection=None, quicksave=None):
     """Gère les événements du clavier et de la souris."""
+    """player : lecteur de journal en mode relecture (Espace, flèches gauche/droite)."""
+    """profiler : mesures par phase (F3 : activer/désactiver, F4 : export JSON)."""
+    """selection : robot réglé au clavier (Tab / Maj+Tab pour changer), le premier par défaut."""
+    """quicksave : point de reprise en mémoire (F5 : capturer, F9 : restaurer)."""
+    robot = robots[selection.index if selection is not None else 0]
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 running = False
+            elif player is not None and event.key == pygame.K_SPACE:
+                # Relecture : pause / reprise
+                player.paused = not player.paused
+            elif player is not None and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                # Relecture : reculer / avancer de 100 ticks
+                player.seek(100 if event.key == pygame.K_RIGHT else -100)
             elif event.key == pygame.K_r:
-                # Reset des robots
-                for robot in robots:
-                    robot.reset()
+                # Reset des robots (retour au début en relecture)
+                if player is not None:
+                    player.seek(-player.tick)
+                else:
+                    for robot in robots:
+                        robot.reset()
             elif event.key == pygame.K_F1:
                 # Capture d'écran
                 save_screenshot(screen)
             elif event.key == pygame.K_F2:
-                # Basculer l'enregistrement GIF
-                recording = not recording
-                if not recording and frames:
-                    # Sauvegarder l'animation GIF
-                    imageio.mimsave('simulation.gif', frames, fps=24)
-                    frames = []
+                # Basculer l'enregistrement GIF (encodé en flux par le Recorder)
+                if recorder.recording:
+                    recorder.stop()
+                else:
+                    recorder.start()
+            elif profiler is not None and event.key == pygame.K_F3:
+                # Activer / désactiver le profilage et sa surcouche
+                profiler.toggle()
+            elif profiler is not None and event.key == pygame.K_F4:
+                # Exporter les statistiques de profilage
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                profiler.dump(f"profile_{timestamp}.json")
+
+            elif quicksave is not None and event.key == pygame.K_F5:
+                # Capturer l'état complet (pose, PID, historiques)
+                quicksave.save()
+            elif quicksave is not None and event.key == pygame.K_F9:
+                # Revenir au dernier état capturé (ex. pour essayer d'autres gains au même endroit)
+                quicksave.load()
 
-            # Commandes pour ajuster les paramètres PID du robot 1
+            elif selection is not None and event.key == pygame.K_TAB:
+                # Robot suivant (précédent avec Maj)
+                selection.next(-1 if event.mod & pygame.KMOD_SHIFT else 1)
+                robot = robots[selection.index]
+
+            # Commandes pour ajuster les paramètres PID du robot sélectionné
             elif event.key == pygame.K_a:
-                robots[0].pid.kp += 0.1
+                robot.pid.kp += 0.1
             elif event.key == pygame.K_q:
-                robots[0].pid.kp -= 0.1
+                robot.pid.kp -= 0.1
             elif event.key == pygame.K_z:
-                robots[0].pid.ki += 0.01
+                robot.pid.ki += 0.01
             elif event.key == pygame.K_s:
-                robots[0].pid.ki -= 0.01
+                robot.pid.ki -= 0.01
             elif event.key == pygame.K_e:
-                robots[0].pid.kd += 0.05
+                robot.pid.kd += 0.05
             elif event.key == pygame.K_d:
-                robots[0].pid.kd -= 0.05
-
-            # Commandes pour ajuster les paramètres PID du robot 2
-            elif event.key == pygame.K_u:
-                robots[1].pid.kp += 0.1
-            elif event.key == pygame.K_j:
-                robots[1].pid.kp -= 0.1
-            elif event.key == pygame.K_i:
-                robots[1].pid.ki += 0.01
-            elif event.key == pygame.K_k:
-                robots[1].pid.ki -= 0.01
-            elif event.key == pygame.K_o:
-                robots[1].pid.kd += 0.05
-            elif event.key == pygame.K_l:
-                robots[1].pid.kd -= 0.05
+                robot.pid.kd -= 0.05
 
-    return running, recording, frames
+    return running
 
-def record_frame(screen, recording, frames):
-    """Enregistre un cadre pour la création d'un GIF."""
-    if recording:
-        frame = pygame.surfarray.array3d(screen)
-        frame = frame.swapaxes(0, 1)
-        frames.append(frame)
-    return frames
+def record_frame(screen, recorder):
+    """Envoie le cadre courant à l'enregistreur s'il est actif."""
+    if recorder.recording:
+        recorder.add_frame(screen)
@@ -1,7 +1,101 @@
+import numpy as np
 import pygame
 from typing import List, Tuple
 from configuration.colors import *
 from configuration.screen import *
+from src.profiling import PHASES
+
+# Nombre maximal de robots listés dans le panneau d'informations et dans les légendes
+INFO_MAX_ROBOTS = 10
+LEGEND_MAX_ROBOTS = 8
+
+class ScrollingPlot:
+    """
+    Fond et courbes d'un graphique PID, gardés dans une surface qui défile.
+
+    L'échantillon ``g`` d'un historique (``RingBuffer.total`` compte les ajouts) est à
+    la colonne ``g * width // window`` : à chaque image, la surface est décalée vers
+    la gauche d'autant de colonnes que les nouveaux échantillons en occupent, puis
+    seuls les nouveaux segments sont tracés dans la bande libérée. ``window`` est la
+    capacité des historiques : tout l'historique tient dans la largeur du graphique.
+
+    Quand une colonne reçoit plusieurs échantillons (historique plus long que la
+    largeur en pixels), ils sont réduits à leur premier point, leur minimum, leur
+    maximum et leur dernier point : le tracé coûte au plus 4 sommets par colonne.
+    """
+
+    def __init__(self, width, height):
+        self.width = int(width)
+        self.height = height
+        self.surface = pygame.Surface((self.width, int(height)))
+        self._key = None
+        self._reference = 0
+        self._seen = []
+        self.clear(0, self.width)
+
+    def clear(self, start, stop):
+        """Efface les colonnes [start, stop) : fond, lignes de grille et axe central."""
+        height = self.height
+        self.surface.fill((40, 40, 60), (start, 0, stop - start, int(height)))
+        for i in range(1, 5):
+            pygame.draw.line(self.surface, (60, 60, 80), (start, i * height//5), (stop, i * height//5), 1)
+        pygame.draw.line(self.surface, (100, 100, 150), (start, height//2), (stop, height//2), 1)
+
+    def update(self, histories, colors):
+        """Met la surface à jour avec les échantillons ajoutés depuis l'appel précédent et la retourne."""
+        window = max(max((history.capacity for history in histories), default=1), 1)
+        totals = [history.total for history in histories]
+        reference = max(totals, default=0)
+        key = (window, tuple(tuple(color) for color in colors), tuple(history.generation for history in histories))
+        shift = reference * self.width // window - self._reference * self.width // window
+
+        # Redessin complet : couleurs, capacité ou nombre de courbes changés, historique
+        # vidé ou restauré, ou plus de nouveaux échantillons que de colonnes
+        full = key != self._key or shift >= self.width
+        if full:
+            self.clear(0, self.width)
+            seen = [0] * len(totals)
+        else:
+            seen = self._seen
+            if shift:
+                self.surface.scroll(-shift, 0)
+                self.clear(self.width - shift, self.width)
+
+        for history, color, total, previous in zip(histories, colors, totals, seen):
+            # Nouveaux échantillons, précédés du dernier déjà tracé (pour relier les segments)
+            count = min(total - previous + 1, len(history))
+            if total > previous and count > 1:
+                self.draw_samples(history.view()[-count:], total - count, reference, window, color)
+
+        self._key = key
+        self._reference = reference
+        self._seen = totals
+        return self.surface
+
+    def draw_samples(self, values, first, reference, window, color):
+        """Trace les échantillons ``first``, ``first + 1``... (abscisses relatives à ``reference``)."""
+        width, height = self.width, self.height
+        indices = np.arange(first, first + len(values))
+        # Même calcul que px = x + width - (n - i) * width/window (colonnes entières)
+        columns = width - (reference * width // window - indices * width // window)
+        # py = y + min(height, max(-height, height//2 - error * height//3))
+        rows = np.clip(height//2 - values * height // 3, -height, height)
+
+        starts = np.flatnonzero(np.diff(columns, prepend=columns[0] - 1))
+        if len(starts) == len(values):
+            vertices = np.column_stack((columns, rows))
+        else:
+            # Réduction min/max : premier, minimum, maximum et dernier point de chaque colonne
+            ends = np.append(starts[1:], len(values)) - 1
+            vertices = np.empty((len(starts), 4, 2))
+            vertices[..., 0] = columns[starts, None]
+            vertices[:, 0, 1] = rows[starts]
+            vertices[:, 1, 1] = np.minimum.reduceat(rows, starts)
+            vertices[:, 2, 1] = np.maximum.reduceat(rows, starts)
+            vertices[:, 3, 1] = rows[ends]
+            vertices = vertices.reshape(-1, 2)
+        pygame.draw.lines(self.surface, color, False, vertices, 2)
+
 
 class Visualization:
     def __init__(self, width, height):
@@ -10,79 +104,102 @@ class Visualization:
         self.font = pygame.font.SysFont('Arial', 18)
         self.title_font = pygame.font.SysFont('Arial', 28, bold=True)
 
+        # Textes statiques pré-rendus une seule fois
+        controls = [
+            "Robot sélectionné: Q/A Kp, W/S Ki, E/D Kd",
+            "Tab / Maj+Tab: robot suivant / précédent",
+            "R: Reset | F1: Screenshot | ESC: Quit",
+            "F3: Profilage | F4: Export du profil",
+            "F5: Capturer l'état | F9: Revenir à l'état capturé"
+        ]
+        self.controls_text = [self.font.render(line, True, WHITE) for line in controls]
+        self.title_text = self.title_font.render("Simulation Moose Test - Robot Suiveur de Ligne PID", True, YELLOW)
+        self.info_text = self.font.render("Utilisez les touches pour ajuster les paramètres PID en temps réel", True, LIGHT_BLUE)
+        # Zones occupées par le titre et le texte d'information (surcouche)
+        self.title_rects = [
+            self.title_text.get_rect(topleft=(self.width // 2 - self.title_text.get_width() // 2, 10)),
+            self.info_text.get_rect(topleft=(self.width // 2 - self.info_text.get_width() // 2, self.height - 30)),
+        ]
+        self.graph_title_text = self.title_font.render("Erreur PID", True, LIGHT_BLUE)
+        # Légendes rendues à la demande puis gardées (clé : texte et couleur)
+        self.legend_cache = {}
+        # Courbes de chaque graphique (clé : position et taille)
+        self.plots = {}
+
+    def legend(self, label, color):
+        """Texte de légende pré-rendu."""
+        key = (label, tuple(color))
+        text = self.legend_cache.get(key)
+        if text is None:
+            text = self.legend_cache[key] = self.font.render(label, True, color)
+        return text
+
     def draw_info(self, surface, robots, selected):
-        """Affiche les informations PID des robots."""
+        """Affiche les informations PID des robots (au plus INFO_MAX_ROBOTS autour du robot sélectionné)."""
         y = 10
-        for i, r in enumerate(robots):
-            name = f"Robot {i+1} (Kp={r.pid.kp:.2f}, Ki={r.pid.ki:.2f}, Kd={r.pid.kd:.2f})"
-            text = self.font.render(name, True, BLUE if i == 0 else ORANGE)
+        first = min(max(0, selected - INFO_MAX_ROBOTS // 2), max(0, len(robots) - INFO_MAX_ROBOTS))
+        for i in range(first, min(len(robots), first + INFO_MAX_ROBOTS)):
+            r = robots[i]
+            marker = "> " if i == selected and len(robots) > 1 else ""
+            label = f"Robot {i+1}" + (f" {r.name}" if r.name else "")
+            text = self.font.render(f"{marker}{label} (Kp={r.pid.kp:.2f}, Ki={r.pid.ki:.2f}, Kd={r.pid.kd:.2f})", True, r.color)
             surface.blit(text, (10, y))
             y += 25
+        if len(robots) > INFO_MAX_ROBOTS:
+            surface.blit(self.font.render(f"... {len(robots)} robots", True, GRAY), (10, y))
+            y += 25
 
-        controls = [
-            "Contrôles Robot 1: Q/A Kp, W/S Ki, E/D Kd",
-            "Contrôles Robot 2: U/J Kp, I/K Ki, O/L Kd",
-            "R: Reset | F1: Screenshot | ESC: Quit"
-        ]
-        for line in controls:
-            text = self.font.render(line, True, WHITE)
+        for text in self.controls_text:
             surface.blit(text, (10, y))
             y += 22
 
-    def draw_pid_graph(self, surface, errors1, errors2, x, y, width, height):
-        """Dessine le graphique PID"""
-        # Cadre du graphique
-        pygame.draw.rect(surface, (40, 40, 60), (x, y, width, height))
+    def draw_pid_graph(self, surface, histories, colors, x, y, width, height, labels=None):
+        """Dessine le graphique PID (une courbe par historique) et retourne le rectangle du graphique."""
+        frame = pygame.Rect(x, y, width, height)
+        # Courbes : surface défilante mise à jour avec les seuls nouveaux échantillons
+        plot = self.plots.get((x, y, width, height))
+        if plot is None:
+            plot = self.plots[(x, y, width, height)] = ScrollingPlot(width, height)
+        surface.blit(plot.update(histories, colors), (x, y))
         pygame.draw.rect(surface, (100, 100, 150), (x, y, width, height), 2)
-        
+
         # Titre
-        title = self.title_font.render("Erreur PID", True, LIGHT_BLUE)
+        title = self.graph_title_text
         surface.blit(title, (x + width//2 - title.get_width()//2, y + 10))
-        
-        # Lignes de grille
-        for i in range(1, 5):
-            pygame.draw.line(surface, (60, 60, 80),
-                            (x, y + i * height//5),
-                            (x + width, y + i * height//5), 1)
-        
-        # Axe central (zéro)
-        pygame.draw.line(surface, (100, 100, 150),
-                        (x, y + height//2),
-                        (x + width, y + height//2), 1)
-        
-        # Courbe d'erreur pour le robot 1
-        if len(errors1) > 1:
-            points = []
-            for i, error in enumerate(errors1):
-                px = x + width - (len(errors1) - i) * width/100
-                py = y + min(height, max(-height,height//2 - error * height//3))
-                points.append((px, py))
-            
-            pygame.draw.lines(surface, BLUE, False, points, 2)
-        
-        # Courbe d'erreur pour le robot 2
-        if len(errors2) > 1:
-            points = []
-            for i, error in enumerate(errors2):
-                px = x + width - (len(errors2) - i) *  width/100
-                py = y + min(height, max(-height,height//2 - error * height//3))
-                points.append((px, py))
-            
-            pygame.draw.lines(surface, ORANGE, False, points, 2)
-        
-        # Légendes
-        pygame.draw.line(surface, BLUE, (x + 20, y + height - 30), (x + 50, y + height - 30), 2)
-        pygame.draw.line(surface, ORANGE, (x + 20, y + height - 10), (x + 50, y + height - 10), 2)
-        
-        text1 = self.font.render("Robot 1", True, BLUE)
-        text2 = self.font.render("Robot 2", True, ORANGE)
-        surface.blit(text1, (x + 60, y + height - 45))
-        surface.blit(text2, (x + 60, y + height - 25))
+
+        # Légendes (de bas en haut, au plus LEGEND_MAX_ROBOTS)
+        if labels is None:
+            labels = [f"Robot {i+1}" for i in range(len(colors))]
+        entries = list(zip(labels, colors))[:LEGEND_MAX_ROBOTS]
+        for k, (label, color) in enumerate(entries):
+            line_y = y + height - 10 - 20 * (len(entries) - 1 - k)
+            pygame.draw.line(surface, color, (x + 20, line_y), (x + 50, line_y), 2)
+            surface.blit(self.legend(label, color), (x + 60, line_y - 15))
+        return frame
+
+    def draw_profile(self, surface, profiler, x=10, y=None):
+        """Affiche les temps par phase (moyenne, p95, max en ms) et retourne le rectangle occupé."""
+        stats = profiler.stats()
+        lines = ["Phase      moy    p95    max (ms)"]
+        for name in PHASES + ('frame',):
+            if name in stats:
+                s = stats[name]
+                lines.append(f"{name:8s} {s['mean']:6.2f} {s['p95']:6.2f} {s['max']:6.2f}")
+        texts = [self.font.render(line, True, LIGHT_GRAY) for line in lines]
+        width = max(text.get_width() for text in texts) + 20
+        height = len(texts) * 20 + 10
+        if y is None:
+            y = self.height - 45 - height
+        frame = pygame.draw.rect(surface, (20, 20, 40), (x, y, width, height))
+        pygame.draw.rect(surface, (100, 100, 150), frame, 1)
+        for i, text in enumerate(texts):
+            surface.blit(text, (x + 10, y + 5 + i * 20))
+        return frame
 
     def draw_title(self, surface):
         """Dessine le titre principal de la simulation."""
-        title = self.title_font.render("Simulation Moose Test - Robot Suiveur de Ligne PID", True, YELLOW)
+        title = self.title_text
         surface.blit(title, (self.width // 2 - title.get_width() // 2, 10))
 
-        info_text = self.font.render("Utilisez les touches pour ajuster les paramètres PID en temps réel", True, LIGHT_BLUE)
+        info_text = self.info_text
         surface.blit(info_text, (self.width // 2 - info_text.get_width() // 2, self.height - 30))
@@ -0,0 +1,94 @@
+"""
+Points de reprise : restauration, reconstruction, fichier .npz et embranchements.
+
+Chaque chemin doit reproduire exactement la suite de la simulation d'origine.
+"""
+import numpy as np
+import pytest
+from src.checkpoint import Checkpoint, fork
+from src.robot import Robot
+from src.simulation import Simulation
+from src.track import Track
+
+TICKS = 200
+KEYS = ('x', 'y', 'angle', 'error', 'output')
+
+
+def make_simulation() -> Simulation:
+    robots = [Robot(50, 325, kp=0.1, ki=0.1, kd=0.1, name='a', theta=90),
+              Robot(50, 315, kp=0.2, kd=0.1, name='b', theta=90)]
+    simulation = Simulation(Track(), robots)
+    simulation.run(60)
+    return simulation
+
+
+def histories(simulation: Simulation) -> list:
+    return [(robot.path_history.view().copy(), robot.pid.error_history.view().copy(),
+             robot.pid.output_history.view().copy()) for robot in simulation.robots]
+
+
+def assert_same_run(trace: dict, reference: dict):
+    for key in reference:
+        np.testing.assert_array_equal(trace[key], reference[key], err_msg=key)
+
+
+@pytest.fixture()
+def capture():
+    """Point de reprise au tick 60, suite de référence et historiques à la fin de la suite."""
+    simulation = make_simulation()
+    checkpoint = Checkpoint.capture(simulation)
+    reference = simulation.run(TICKS)
+    return checkpoint, reference, histories(simulation), simulation
+
+
+def test_capture_restore(capture):
+    checkpoint, reference, reference_histories, simulation = capture
+    checkpoint.restore(simulation)
+    assert simulation.tick == 60
+    assert_same_run(simulation.run(TICKS), reference)
+    for robot_histories, expected in zip(histories(simulation), reference_histories):
+        for values, expected_values in zip(robot_histories, expected):
+            np.testing.assert_array_equal(values, expected_values)
+
+
+def test_capture_build(capture):
+    checkpoint, reference, reference_histories, _ = capture
+    simulation = checkpoint.build()
+    assert [robot.name for robot in simulation.robots] == ['a', 'b']
+    assert_same_run(simulation.run(TICKS), reference)
+    for robot_histories, expected in zip(histories(simulation), reference_histories):
+        for values, expected_values in zip(robot_histories, expected):
+            np.testing.assert_array_equal(values, expected_values)
+
+
+def test_save_load(capture, tmp_path):
+    checkpoint, reference, _, _ = capture
+    path = tmp_path / 'checkpoint.npz'
+    checkpoint.save(path)
+    loaded = Checkpoint.load(path)
+    assert loaded.meta == checkpoint.meta
+    assert loaded.arrays.keys() == checkpoint.arrays.keys()
+    assert_same_run(loaded.build().run(TICKS), reference)
+
+
+def test_restore_rejects_other_robot_count(capture):
+    checkpoint, _, _, _ = capture
+    with pytest.raises(ValueError):
+        checkpoint.restore(Simulation(Track(), [Robot()]))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_fork_empty_variant_continues_simulation(capture, workers):
+    checkpoint, reference, _, _ = capture
+    branches = fork(checkpoint, [{}, {'kp': 0.3}, {}], TICKS, workers=workers, chunk_size=1)
+    for branch in (branches[0], branches[2]):
+        for key in KEYS:
+            np.testing.assert_array_equal(branch[key], reference[key], err_msg=key)
+    assert not np.array_equal(branches[1]['x'], reference['x'])
+    assert branches[1]['variant'] == {'kp': 0.3}
+
+
+def test_fork_rejects_unknown_parameter(capture):
+    checkpoint, _, _, _ = capture
+    with pytest.raises(ValueError):
+        fork(checkpoint, [{'gain': 1.0}], TICKS)
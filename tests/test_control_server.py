@@ -0,0 +1,83 @@
+"""
+Validation des commandes du serveur de contrôle.
+"""
+import json
+import socket
+import pytest
+from src.control_server import ControlServer
+from src.robot import Robot
+
+
+class FakeClient:
+    """Client sans connexion : garde les lignes envoyées."""
+
+    def __init__(self):
+        self.lines = []
+
+    def send(self, line: bytes):
+        self.lines.append(json.loads(line))
+
+
+def receive(server: ControlServer, text: str) -> list:
+    """Passe une ligne au serveur ; retourne les messages d'erreur renvoyés au client."""
+    client = FakeClient()
+    server._receive(client, text.encode())
+    return [line['error'] for line in client.lines]
+
+
+@pytest.mark.parametrize('command', [
+    '{"id": 1e999}',
+    '{"id": 1.7}',
+    '{"id": "1"}',
+    '{"id": true}',
+    '{"id": 0, "steering": NaN}',
+    '{"id": 0, "kp": Infinity}',
+    '{"id": 0, "kd": -Infinity}',
+    '{"id": 0, "ki": "0.1"}',
+    '{"id": 0, "reset": "false"}',
+    '{"id": 0, "reset": 0}',
+    '{"id": 0, "reset": null}',
+    '{"id": 0, "speed": 3}',
+    '{}',
+])
+def test_invalid_commands_are_rejected(command):
+    server = ControlServer()
+    errors = receive(server, f'{{"robots": [{command}]}}')
+    assert len(errors) == 1 and errors[0].startswith("Commande invalide")
+    assert server.commands.empty()
+
+
+def test_valid_commands_are_applied():
+    server = ControlServer()
+    assert receive(server, '{"robots": [{"id": 0, "steering": 1.5, "kp": 0.3, "kd": 1}, '
+                           '{"id": 1, "reset": true}, {"id": 5, "steering": null}]}') == []
+    robots = [Robot(record_history=False), Robot(record_history=False)]
+    robots[1].x += 100
+    assert server.apply_commands(robots) == 2
+    assert robots[0].steering_override == 1.5
+    assert (robots[0].pid.kp, robots[0].pid.kd) == (0.3, 1.0)
+    assert robots[1].x == robots[1].start_pos[0]
+
+
+def test_reset_false_keeps_robot():
+    server = ControlServer()
+    assert receive(server, '{"robots": [{"id": 0, "reset": false}]}') == []
+    robot = Robot(record_history=False)
+    robot.x += 100
+    server.apply_commands([robot])
+    assert robot.x == robot.start_pos[0] + 100
+
+
+def test_overflowing_id_gets_error_line_on_live_server():
+    server = ControlServer(port=0)
+    server.start()
+    try:
+        with socket.create_connection((server.host, server.port), timeout=5) as sock:
+            lines = sock.makefile()
+            sock.sendall(b'{"robots": [{"id": 1e999, "steering": 1}]}\n')
+            assert json.loads(lines.readline())['error'].startswith("Commande invalide")
+            # La connexion reste ouverte : une commande valide est acceptée ensuite
+            sock.sendall(b'{"robots": [{"id": 0, "steering": 1}]}\n')
+            assert server.commands.get(timeout=5) == [{'id': 0, 'steering': 1.0}]
+    finally:
+        server.stop()
@@ -0,0 +1,79 @@
+"""
+Équivalence des chemins de calcul rapides avec le calcul scalaire de ``Robot.update``
+sur la piste Moose Test : distances vectorisées, ``RobotSwarm`` (NumPy et noyau fusionné).
+
+Lancement depuis la racine du dépôt :
+    python -m pytest -q
+"""
+import numpy as np
+import pytest
+from src.geometry import distance_point_to_segment, distances_to_polyline, nearest_segments
+from src.robot import Robot
+from src.swarm import RobotSwarm
+from src.track import Track
+
+TICKS = 300
+# Gains (kp, ki, kd) : réglages stables, oscillant et agressif (robot qui quitte la ligne)
+GAINS = [(0.1, 0.0, 0.1), (0.2, 0.0, 1.0), (0.4, 0.00001, 2.0), (1.25, 0.1, 0.3)]
+
+
+def make_robots() -> list:
+    return [Robot(50, 325 + 5 * i, kp=kp, ki=ki, kd=kd, theta=90, record_history=False)
+            for i, (kp, ki, kd) in enumerate(GAINS)]
+
+
+def scalar_run(track: Track, robots: list) -> dict:
+    """Traces de référence : un appel à ``Robot.update`` par robot et par tick."""
+    trace = {key: np.empty((TICKS, len(robots))) for key in ('x', 'y', 'angle', 'error', 'output')}
+    for t in range(TICKS):
+        for i, robot in enumerate(robots):
+            robot.update(track)
+            trace['x'][t, i] = robot.x
+            trace['y'][t, i] = robot.y
+            trace['angle'][t, i] = robot.angle
+            trace['error'][t, i] = robot.current_error
+            trace['output'][t, i] = robot.pid_output
+    return trace
+
+
+@pytest.fixture(scope='module')
+def track() -> Track:
+    return Track()
+
+
+@pytest.fixture(scope='module')
+def reference(track) -> dict:
+    return scalar_run(track, make_robots())
+
+
+def test_distances_match_scalar(track):
+    points = np.random.default_rng(0).uniform((0, 0), (track.width, track.height), (200, 2))
+    segments = list(zip(track.points[:-1], track.points[1:]))
+    expected = [min(distance_point_to_segment(x, y, *start, *end) for start, end in segments) for x, y in points]
+    np.testing.assert_array_equal(distances_to_polyline(points, track.points), expected)
+    distances, indices = nearest_segments(points, track.points)
+    np.testing.assert_array_equal(distances, expected)
+    np.testing.assert_array_equal(
+        [distance_point_to_segment(x, y, *segments[k][0], *segments[k][1]) for (x, y), k in zip(points, indices)],
+        expected)
+
+
+@pytest.mark.parametrize('fused', [False, True], ids=['numpy', 'fused'])
+def test_swarm_matches_robot_update(track, reference, fused):
+    swarm = RobotSwarm.from_robots(make_robots())
+    swarm.fused = fused
+    trace = swarm.run(track, TICKS)
+    for key, values in reference.items():
+        np.testing.assert_array_equal(trace[key], values, err_msg=key)
+
+
+def test_swarm_rejects_mixed_sensor_layouts():
+    robots = make_robots()
+    robots.append(Robot(50, 325, sensor_positions_local=[(-10, 32), (0, 32), (10, 32)], sensor_weights=[-1, 0, 1],
+                        record_history=False))
+    with pytest.raises(ValueError):
+        RobotSwarm.from_robots(robots)
+    # Mêmes positions, poids différents
+    robots[-1] = Robot(50, 325, sensor_weights=[-4, -1, 0, 1, 4], record_history=False)
+    with pytest.raises(ValueError):
+        RobotSwarm.from_robots(robots)
@@ -0,0 +1,61 @@
+"""
+Index spatial des segments (``SegmentGrid``) comparé à la recherche exhaustive.
+"""
+import numpy as np
+import pytest
+from src.geometry import SegmentGrid, distance_point_to_segment
+
+
+def brute_force(segments: list, x: float, y: float) -> float:
+    return min(distance_point_to_segment(x, y, *segment) for segment in segments)
+
+
+def random_polyline(rng, n: int) -> np.ndarray:
+    """Marche aléatoire (segments de longueurs variées, croisements et demi-tours)."""
+    return np.cumsum(rng.normal(0, 15, (n, 2)), axis=0) + (400, 300)
+
+
+def query_points(rng, points: np.ndarray) -> np.ndarray:
+    """Points dans la grille, juste autour et loin de la grille."""
+    low, high = points.min(axis=0), points.max(axis=0)
+    span = high - low
+    inside = rng.uniform(low, high, (150, 2))
+    around = rng.uniform(low - 0.3 * span, high + 0.3 * span, (150, 2))
+    far = rng.uniform(low - 20 * span, high + 20 * span, (50, 2))
+    on_vertices = points[rng.integers(0, len(points), 20)]
+    return np.vstack([inside, around, far, on_vertices])
+
+
+@pytest.mark.parametrize('seed, n, cell_size', [(0, 200, None), (1, 500, None), (2, 300, 3.0), (3, 40, 200.0)])
+def test_nearest_matches_brute_force(seed, n, cell_size):
+    rng = np.random.default_rng(seed)
+    points = random_polyline(rng, n)
+    grid = SegmentGrid(points, cell_size)
+    for x, y in query_points(rng, points):
+        distance, index = grid.nearest(x, y)
+        expected = brute_force(grid.segments, x, y)
+        assert distance == expected
+        assert distance_point_to_segment(x, y, *grid.segments[index]) == expected
+
+
+@pytest.mark.parametrize('max_distance', [0.5, 5.0, 40.0, 1e6])
+def test_nearest_with_max_distance_matches_brute_force(max_distance):
+    rng = np.random.default_rng(4)
+    points = random_polyline(rng, 300)
+    grid = SegmentGrid(points)
+    for x, y in query_points(rng, points):
+        distance, index = grid.nearest(x, y, max_distance)
+        expected = brute_force(grid.segments, x, y)
+        if expected < max_distance:
+            assert distance == expected
+            assert distance_point_to_segment(x, y, *grid.segments[index]) == expected
+        else:
+            assert (distance, index) == (max_distance, -1)
+
+
+def test_degenerate_polylines():
+    assert SegmentGrid([]).nearest(1, 2) == (float('inf'), -1)
+    # Segment unique, vertical (grille d'une colonne)
+    grid = SegmentGrid([(10, 0), (10, 100)])
+    assert grid.nearest(13, 50) == (3.0, 0)
+    assert grid.nearest(-500, 50, max_distance=20) == (20, -1)
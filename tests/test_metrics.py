@@ -0,0 +1,42 @@
+"""
+Métriques de suivi (``trajectory_metrics``) sur la piste Moose Test.
+"""
+import numpy as np
+from src.metrics import trajectory_metrics
+from src.swarm import RobotSwarm
+from src.sweep import DEFAULT_POSE
+from src.track import Track
+
+
+def run(kp, kd, ticks=1000) -> dict:
+    track = Track()
+    x, y, theta = DEFAULT_POSE
+    swarm = RobotSwarm(len(kp), start_x=x, start_y=y, theta=theta, kp=kp, kd=kd)
+    trace = swarm.run(track, ticks)
+    return trajectory_metrics(trace['x'], trace['y'], track)
+
+
+def test_stable_robot_completes():
+    metrics = run(kp=[0.1], kd=[0.1])
+    assert metrics['completed'][0]
+    assert metrics['progress'][0] > 0.9
+    assert metrics['max_cte'][0] < 20
+
+
+def test_diverging_robot_does_not_report_full_progress():
+    # Robots qui quittent la ligne : projetés sur le dernier segment une fois perdus
+    metrics = run(kp=[0.4, 0.4], kd=[0.1, 2.0])
+    assert not metrics['completed'].any()
+    assert (metrics['max_cte'] > 1000).all()
+    assert (metrics['progress'] < 0.5).all()
+
+
+def test_progress_stops_at_first_lost_tick():
+    track = Track()
+    points = np.array(track.get_track_points(), dtype=float)
+    # Sur la ligne jusqu'au milieu de la piste, puis saut près du dernier point mais hors de la ligne
+    middle = len(points) // 2
+    path = np.vstack([points[:middle + 1], points[-1] + (0.0, 200.0)])
+    metrics = trajectory_metrics(path[:, :1], path[:, 1:], track)
+    expected = track.get_arc_length()[middle] / track.get_length()
+    np.testing.assert_allclose(metrics['progress'], [expected])
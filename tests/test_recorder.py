@@ -0,0 +1,74 @@
+"""
+Enregistreur vidéo/GIF en flux : cadence et erreurs d'encodage.
+"""
+import time
+import imageio
+import pygame
+from src import recorder as recorder_module
+from src.recorder import GIF_MAX_FPS, Recorder
+
+
+class FailingWriter:
+    """Writer imageio qui échoue à la première image (ex. disque plein)."""
+
+    def append_data(self, frame):
+        raise OSError("disque plein")
+
+    def close(self):
+        pass
+
+
+def test_for_loop_limits_gif_rate():
+    gif = Recorder.for_loop('simulation.gif', 60)
+    assert gif.fps <= GIF_MAX_FPS
+    # Lecture à vitesse réelle : images gardées par seconde de simulation = cadence du GIF
+    assert 60 / (gif.frame_skip + 1) == gif.fps
+    video = Recorder.for_loop('simulation.mp4', 60)
+    assert (video.fps, video.frame_skip) == (60, 0)
+
+
+def test_gif_keeps_one_frame_in_n(tmp_path):
+    path = str(tmp_path / 'out.gif')
+    recorder = Recorder.for_loop(path, 60)
+    surface = pygame.Surface((16, 12))
+    recorder.start()
+    for i in range(9):
+        # Images toutes différentes (Pillow fusionne les images identiques consécutives)
+        surface.fill((25 * i, 0, 0))
+        recorder.add_frame(surface)
+    recorder.stop()
+    assert recorder.error is None
+    with imageio.get_reader(path) as reader:
+        frames = [reader.get_meta_data(i)['duration'] for i in range(reader.get_length())]
+    assert len(frames) == 9 // (recorder.frame_skip + 1)
+    # Durée de chaque image (ms) : lecture à vitesse réelle
+    assert frames == [1000 / recorder.fps] * len(frames)
+
+
+def test_encoder_error_ends_recording_without_raising(monkeypatch, capsys):
+    monkeypatch.setattr(recorder_module.imageio, 'get_writer', lambda *args, **kwargs: FailingWriter())
+    recorder = Recorder('out.gif', queue_size=2)
+    surface = pygame.Surface((16, 12))
+    recorder.start()
+    deadline = time.monotonic() + 5
+    while recorder.recording and time.monotonic() < deadline:
+        recorder.add_frame(surface)
+        time.sleep(0.01)
+    assert not recorder.recording
+    assert isinstance(recorder.error, OSError)
+    assert "Échec de l'enregistrement" in capsys.readouterr().err
+    # Arrêt explicite après coup : sans effet
+    recorder.stop()
+
+
+def test_stop_does_not_block_when_encoder_died(monkeypatch):
+    monkeypatch.setattr(recorder_module.imageio, 'get_writer', lambda *args, **kwargs: FailingWriter())
+    recorder = Recorder('out.gif', queue_size=1)
+    recorder.start()
+    recorder.add_frame(pygame.Surface((16, 12)))
+    recorder._thread.join(timeout=5)
+    # File pleine et encodeur arrêté : la sentinelle ne doit pas bloquer
+    if not recorder._queue.full():
+        recorder._queue.put_nowait(None)
+    recorder.stop()
+    assert not recorder.recording and isinstance(recorder.error, OSError)
@@ -0,0 +1,73 @@
+"""
+Journal binaire : écriture, relecture, accès direct et capteurs de tailles différentes.
+"""
+import numpy as np
+import pytest
+from src.replay_log import HEADER, TraceReader, TraceWriter, record_dtype
+from src.robot import Robot
+from src.simulation import Simulation
+from src.track import Track
+
+TICKS = 300
+
+
+def make_robots() -> list:
+    return [Robot(50, 325, kp=0.1, kd=0.1, theta=90),
+            Robot(50, 315, kp=0.2, kd=0.1, theta=90,
+                  sensor_positions_local=[(-10, 32), (0, 32), (10, 32)], sensor_weights=[-1, 0, 1])]
+
+
+@pytest.fixture()
+def recorded(tmp_path):
+    """Journal de TICKS ticks (blocs de 64 ticks, le dernier incomplet) et traces de référence."""
+    path = str(tmp_path / 'run.trace')
+    robots = make_robots()
+    with TraceWriter(path, len(robots), max(len(r.sensor_positions_local) for r in robots), chunk_ticks=64) as log:
+        trace = Simulation(Track(), robots, log=log).run(TICKS)
+    return path, trace
+
+
+def test_round_trip(recorded):
+    path, trace = recorded
+    reader = TraceReader(path)
+    assert (len(reader), reader.n_robots, reader.n_sensors) == (TICKS, 2, 5)
+    np.testing.assert_array_equal(reader.records['tick'], np.arange(TICKS))
+    for key, field in (('x', 'x'), ('y', 'y'), ('angle', 'angle'), ('error', 'current_error')):
+        np.testing.assert_array_equal(reader.records[field], trace[key].astype(np.float32))
+    # Capteurs : nombre propre à chaque robot, lectures complétées par des zéros
+    np.testing.assert_array_equal(reader.records['sensor_count'], [[5, 3]] * TICKS)
+    np.testing.assert_array_equal(reader.records['sensor_values'], trace['sensor_values'])
+    assert (reader.records['sensor_values'][:, 1, 3:] == 0).all()
+
+
+def test_seek_to_middle_tick(recorded):
+    path, trace = recorded
+    reader = TraceReader(path)
+    robots = make_robots()
+    tick = TICKS // 2
+    reader.seek(robots, tick)
+    for i, robot in enumerate(robots):
+        assert (robot.x, robot.y, robot.angle) == (np.float32(trace['x'][tick, i]), np.float32(trace['y'][tick, i]),
+                                                    np.float32(trace['angle'][tick, i]))
+        assert len(robot.sensor_values) == len(robot.sensor_positions_local)
+        assert robot.sensor_values == trace['sensor_values'][tick, i, :len(robot.sensor_values)].tolist()
+        # Historique reconstruit jusqu'au tick (fenêtre de la capacité de l'historique)
+        path_history = robot.path_history.view()
+        window = min(tick + 1, robot.path_history.capacity)
+        assert len(path_history) == window
+        np.testing.assert_array_equal(path_history[-1], np.float32([trace['x'][tick, i], trace['y'][tick, i]]))
+        np.testing.assert_array_equal(path_history[:, 0], trace['x'][tick + 1 - window:tick + 1, i].astype(np.float32))
+
+
+def test_truncated_last_tick_is_ignored(recorded):
+    path, _ = recorded
+    with open(path, 'ab') as f:
+        f.write(b'\0' * (record_dtype(2, 5).itemsize // 2))
+    assert len(TraceReader(path)) == TICKS
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(HEADER.pack(b'XXXX', 1, 0, 1, 5))
+    with pytest.raises(ValueError):
+        TraceReader(str(path))
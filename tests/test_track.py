@@ -0,0 +1,54 @@
+"""
+Projection sur la piste : recherche avec indice de départ, recherche globale et projection vectorisée.
+"""
+import numpy as np
+import pytest
+from src.track import Track
+
+
+def test_walk_passes_tie_on_shared_vertex():
+    # Le point est à la même distance (5) des segments 0 et 1, par leur sommet commun (10, 0),
+    # mais bien plus près du segment 2 : la marche depuis le segment 0 ne doit pas s'arrêter à l'égalité
+    track = Track()
+    track.set_track_points([(0, 0), (10, 0), (10, -10), (12, 6), (40, 6)])
+    s, lateral, _, segment = track.project(10, 5, hint=0)
+    assert segment == 2
+    assert (s, lateral) == pytest.approx(track.project(10, 5)[:2])
+
+
+@pytest.mark.parametrize('path, options', [
+    ('tracks/moose.json', {'spacing': 3}),
+    ('tracks/slalom.svg', {'smoothing': 'catmull-rom', 'spacing': 5}),
+    ('tracks/slalom.svg', {}),
+])
+def test_hinted_projection_matches_global_and_project_many(path, options):
+    track = Track.from_file(path, **options)
+    points = np.array(track.get_track_points(), dtype=float)
+    rng = np.random.default_rng(1)
+    # Trajectoire près de la ligne, qui passe par les sommets communs aux segments (assez près pour que
+    # la portion de piste la plus proche soit sans ambiguïté : à l'intérieur d'un virage serré, la
+    # projection avec indice reste volontairement sur sa portion)
+    steps = np.linspace(0, len(points) - 1, 4 * len(points))
+    i = np.minimum(steps.astype(int), len(points) - 2)
+    t = (steps - i)[:, None]
+    path_points = points[i] * (1 - t) + points[i + 1] * t + rng.normal(0, 4, (len(steps), 2))
+
+    hint, hints = None, None
+    for x, y in path_points:
+        s, lateral, heading, hint = track.project(x, y, hint=hint)
+        s_global, lateral_global, heading_global, _ = track.project(x, y)
+        s_many, lateral_many, heading_many, hints = track.project_many([(x, y)], hints)
+        assert (s, lateral) == pytest.approx((s_global, lateral_global), abs=1e-9)
+        assert (s, lateral) == pytest.approx((s_many[0], lateral_many[0]), abs=1e-9)
+
+
+def test_project_many_follows_walk_past_local_minimum():
+    # Depuis le segment 8, la fenêtre de project_many trouve d'abord le minimum local du segment 5 ;
+    # recentrée, elle rejoint comme la marche le vrai minimum (segments 1 et 2, à 1 pixel)
+    track = Track()
+    track.set_track_points([(-20, 1), (-10, 1), (0, 1), (10, 1), (10, 30), (-10, 30), (0, 6), (20, 10),
+                            (30, 10), (40, 10), (50, 10)])
+    expected = track.project(0, 0)[:2]
+    assert track.project(0, 0, hint=8)[:2] == pytest.approx(expected)
+    s, lateral, _, _ = track.project_many([(0, 0)], [8])
+    assert (s[0], lateral[0]) == pytest.approx(expected)
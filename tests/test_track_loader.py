@@ -0,0 +1,132 @@
+"""
+Lecture des chemins SVG et cache disque des pistes traitées.
+"""
+import json
+import os
+import numpy as np
+import pytest
+from src import track_loader
+from src.track_loader import BEZIER_SAMPLES, _bezier, cache_key, load_track_data, parse_svg_path
+
+
+def assert_points(d: str, expected):
+    points, _ = parse_svg_path(d)
+    np.testing.assert_allclose(points, expected)
+
+
+def test_implicit_lines_after_move():
+    assert_points("M 0 0 10 0 20 5", [(0, 0), (10, 0), (20, 5)])
+    assert_points("m 1 1 2 0 0 3", [(1, 1), (3, 1), (3, 4)])
+
+
+def test_repeated_commands():
+    assert_points("M0,0 L1,2 3,4", [(0, 0), (1, 2), (3, 4)])
+    assert_points("M0 0 l1 0 1 0 h2 3 v-1-1", [(0, 0), (1, 0), (2, 0), (4, 0), (7, 0), (7, -1), (7, -2)])
+    # Nombres collés : signe et point décimal séparent les valeurs
+    assert_points("M0-1.5L.5-2 1e1-2", [(0, -1.5), (0.5, -2), (10, -2)])
+
+
+def test_horizontal_vertical_absolute_and_relative():
+    assert_points("M 5 5 H 10 V 0 h -5 v 5", [(5, 5), (10, 5), (10, 0), (5, 0), (5, 5)])
+
+
+def test_close_path_returns_to_start():
+    points, closed = parse_svg_path("M 0 0 L 10 0 L 10 10 Z")
+    assert closed
+    np.testing.assert_allclose(points, [(0, 0), (10, 0), (10, 10), (0, 0)])
+    # Après Z, les coordonnées relatives repartent du début du sous-chemin
+    points, _ = parse_svg_path("M 5 5 L 10 5 z l 0 3")
+    np.testing.assert_allclose(points[-1], (5, 8))
+    assert not parse_svg_path("M 0 0 L 1 1")[1]
+
+
+def test_cubic_smooth_reflects_previous_control_point():
+    points, _ = parse_svg_path("M 0 0 C 0 10 10 10 10 0 S 20 -10 20 0")
+    # Second contrôle de S : reflet de (10, 10) par rapport à (10, 0)
+    expected = np.vstack(([(0, 0)], _bezier(np.array([(0, 0), (0, 10), (10, 10), (10, 0)], dtype=float)),
+                          _bezier(np.array([(10, 0), (10, -10), (20, -10), (20, 0)], dtype=float))))
+    np.testing.assert_allclose(points, expected)
+    # Même chemin en coordonnées relatives
+    relative, _ = parse_svg_path("m 0 0 c 0 10 10 10 10 0 s 10 -10 10 0")
+    np.testing.assert_allclose(relative, expected)
+
+
+def test_quadratic_smooth_reflects_previous_control_point():
+    points, _ = parse_svg_path("M 0 0 Q 5 10 10 0 T 20 0")
+    expected = np.vstack(([(0, 0)], _bezier(np.array([(0, 0), (5, 10), (10, 0)], dtype=float)),
+                          _bezier(np.array([(10, 0), (15, -10), (20, 0)], dtype=float))))
+    np.testing.assert_allclose(points, expected)
+
+
+def test_smooth_without_matching_previous_curve_uses_current_point():
+    # S après une ligne (et T après une cubique) : premier contrôle = point courant
+    points, _ = parse_svg_path("M 0 0 L 10 0 S 20 10 20 0")
+    np.testing.assert_allclose(points[2:], _bezier(np.array([(10, 0), (10, 0), (20, 10), (20, 0)], dtype=float)))
+    points, _ = parse_svg_path("M 0 0 C 0 10 10 10 10 0 T 20 0")
+    np.testing.assert_allclose(points[-BEZIER_SAMPLES:],
+                               _bezier(np.array([(10, 0), (10, 0), (20, 0)], dtype=float)))
+
+
+@pytest.mark.parametrize('d', [
+    "M 0 0 A 5 5 0 0 1 10 0",
+    "M 0 0 a 5 5 0 0 1 10 0",
+    "10 0 L 5 5",
+    "M 0 0 L 10",
+    "M 0 0 C 1 1 2 2 L 3 3",
+])
+def test_invalid_paths_are_rejected(d):
+    with pytest.raises(ValueError):
+        parse_svg_path(d)
+
+
+def write_track(path, points):
+    with open(path, 'w') as f:
+        json.dump({'points': points}, f)
+
+
+def test_cache_is_reused(tmp_path, monkeypatch):
+    path = tmp_path / 'track.json'
+    cache = tmp_path / 'cache'
+    write_track(path, [[0, 0], [100, 0], [100, 50], [0, 80]])
+    first = load_track_data(str(path), smoothing='catmull-rom', spacing=5, cache_dir=str(cache))
+    assert len(os.listdir(cache)) == 1
+
+    # Second chargement : ni lecture ni traitement
+    def fail(*args, **kwargs):
+        raise AssertionError("cache non utilisé")
+    monkeypatch.setattr(track_loader, 'read_points', fail)
+    monkeypatch.setattr(track_loader, 'process_points', fail)
+    second = load_track_data(str(path), smoothing='catmull-rom', spacing=5, cache_dir=str(cache))
+    assert second.keys() == first.keys()
+    for name in ('points', 'segment_lengths', 'arc_length'):
+        np.testing.assert_array_equal(second[name], first[name])
+    assert second['closed'] is False
+
+
+def test_cache_key_follows_content_and_options(tmp_path):
+    path = tmp_path / 'track.json'
+    write_track(path, [[0, 0], [100, 0], [100, 50]])
+    key = cache_key(str(path), smoothing=None, spacing=5)
+    assert cache_key(str(path), spacing=5, smoothing=None) == key
+    assert cache_key(str(path), smoothing='bspline', spacing=5) != key
+    assert cache_key(str(path), smoothing=None, spacing=2) != key
+    # Même contenu ailleurs : même clé ; contenu modifié : nouvelle clé
+    copy = tmp_path / 'copy.json'
+    copy.write_bytes(path.read_bytes())
+    assert cache_key(str(copy), smoothing=None, spacing=5) == key
+    write_track(path, [[0, 0], [100, 0], [100, 60]])
+    assert cache_key(str(path), smoothing=None, spacing=5) != key
+
+
+def test_cache_invalidated_when_source_or_smoothing_changes(tmp_path):
+    path = tmp_path / 'track.json'
+    cache = str(tmp_path / 'cache')
+    write_track(path, [[0, 0], [100, 0], [100, 50]])
+    original = load_track_data(str(path), cache_dir=cache)
+    smoothed = load_track_data(str(path), smoothing='catmull-rom', cache_dir=cache)
+    assert len(smoothed['points']) > len(original['points'])
+
+    write_track(path, [[0, 0], [100, 0], [100, 90]])
+    changed = load_track_data(str(path), cache_dir=cache)
+    np.testing.assert_array_equal(changed['points'][-1], (100, 90))
+    assert len(os.listdir(cache)) == 3